@@ -0,0 +1,21 @@
+"""
+Quizlet Writer creates Quizlet sets from a text file with words and the definitions, which Quizlet suggests for them
+
+The GUI-free core lives in quizlet_writer.core. The GUI classes are imported from quizlet_writer.gui on first access,
+so code which only needs the core never loads tkinter.
+"""
+
+from .core import *
+from .core import __all__ as _core_all
+
+_GUI_NAMES = ('center_window_in_parent', 'UserDataForm', 'Table', 'WordOptions', 'QuizLetWriterApp', 'main')
+
+__all__ = [*_core_all, *_GUI_NAMES]
+
+
+def __getattr__(name):
+    """Imports the GUI names lazily"""
+    if name in _GUI_NAMES:
+        from . import gui
+        return getattr(gui, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
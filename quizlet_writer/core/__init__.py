@@ -0,0 +1,28 @@
+"""
+GUI-free core of the Quizlet Writer: lookup, dedupe and upload of the words through the WebDriver and the user data
+
+Importing the core doesn't load tkinter or the selenium webdriver package. The latter is imported, when the first
+WebDriver is created.
+"""
+
+from .cache import DefinitionCache
+from .compact import CompactPairs, CompactStrings
+from .driver import WebDriver, elements_have_error
+from .formats import read_rows, write_rows
+from .locators import ElementCache, Locators
+from .replay import CommandRecorder, ReplayExecutor
+from .search import WordIndex
+from .sessions import SessionPool
+from .settings import Settings
+from .sharding import shard_names, shard_rows, upload_shards
+from .singleflight import SingleFlight
+from .sinks import DefinitionSink, read_definitions
+from .tracing import CommandTracer
+from .userdata import SyncedSets, UserData
+from .words import del_duplicates, diff_rows, to_import_text
+
+__all__ = ['DefinitionCache', 'CompactPairs', 'CompactStrings', 'WebDriver', 'elements_have_error', 'read_rows',
+           'write_rows', 'ElementCache', 'Locators', 'CommandRecorder', 'ReplayExecutor', 'WordIndex', 'SessionPool',
+           'Settings', 'shard_names', 'shard_rows', 'upload_shards', 'SingleFlight', 'DefinitionSink',
+           'read_definitions', 'CommandTracer', 'SyncedSets', 'UserData', 'del_duplicates', 'diff_rows',
+           'to_import_text']
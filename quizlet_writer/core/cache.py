@@ -0,0 +1,135 @@
+"""A cache of the found definitions, which is shared between the machines through snapshot files"""
+
+import gzip
+import hashlib
+import json
+import os
+import socket
+import threading
+import time
+
+
+class DefinitionCache:
+    """
+    Remembers the definitions, which the lookups found, so a word is looked up in the browser only once. Every entry
+    has the definition, the suggested candidates, the time it was found and the source (the machine), which found it
+
+    The cache is saved into a gzipped JSON snapshot with a format name, a version and a SHA-256 checksum of the
+    entries. Snapshots of different machines are merged deterministically: the newer entry of a word wins, and of two
+    entries found at the same time the one with the greater source wins, so every merge order gives the same cache
+    """
+    FILE_NAME = "definitions.json.gz"
+    FORMAT = "quizlet-writer-definitions"
+    VERSION = 1
+
+    def __init__(self, source=None):
+        """source (str): the name of this machine in the entries, which it adds. The host name if None"""
+        self.__source = source or socket.gethostname()
+        self.__entries = {}
+        self.__lock = threading.Lock()
+        self.__save_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, word):
+        """Returns a tuple (definition, candidates) for the word, or None if it isn't cached"""
+        with self.__lock:
+            entry = self.__entries.get(word)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[0], list(entry[1])
+
+    def put(self, word, definition, candidates=(), timestamp=None, source=None):
+        """
+        Adds a found definition. An older entry of the word is replaced, a newer one is kept
+
+        Inputs:
+        word, definition (str): the word and its definition
+        candidates (iterable): all suggested definitions of the word
+        timestamp (float): the Unix time, when the definition was found. Now if None
+        source (str): the machine, which found the definition. This one if None
+        """
+        entry = (definition, list(candidates), time.time() if timestamp is None else timestamp,
+                 source or self.__source)
+        with self.__lock:
+            return self._merge_entry(word, entry)
+
+    def merge(self, other):
+        """Merges the entries of another DefinitionCache into this one and returns the number of changed words"""
+        return sum(self._merge_entries(other.entries().items()))
+
+    def entries(self):
+        """Returns a dictionary {word: (definition, candidates, timestamp, source)}"""
+        with self.__lock:
+            return dict(self.__entries)
+
+    def load_file(self, path=None):
+        """
+        Merges a snapshot into the cache and returns the number of changed words. Does nothing if the file doesn't
+        exist. Raises ValueError, if the file isn't a snapshot of a known version or its checksum doesn't match
+        """
+        try:
+            with gzip.open(path or DefinitionCache.FILE_NAME, "rb") as file:
+                snapshot = json.loads(file.read().decode("utf-8"))
+        except FileNotFoundError:
+            return 0
+        except (OSError, EOFError, UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ValueError(f"Snapshot is damaged: {e}")
+
+        if not isinstance(snapshot, dict) or snapshot.get('format') != DefinitionCache.FORMAT:
+            raise ValueError("File isn't a definition snapshot")
+        if snapshot.get('version') != DefinitionCache.VERSION:
+            raise ValueError(f"Snapshot version {snapshot.get('version')} isn't supported")
+        records = snapshot.get('entries', [])
+        if snapshot.get('sha256') != DefinitionCache._checksum(records):
+            raise ValueError("Snapshot checksum doesn't match its entries")
+        return sum(self._merge_entries(
+            (word, (definition, candidates, timestamp, source))
+            for word, definition, candidates, timestamp, source in records
+        ))
+
+    def save_file(self, path=None):
+        """
+        Writes the whole cache into a snapshot. The file is replaced at once, so a reader never sees half of it, and
+        the same entries always give the same bytes. Two threads, which save at once, write the file one after another
+        """
+        path = path or DefinitionCache.FILE_NAME
+        records = [[word, *entry] for word, entry in sorted(self.entries().items())]
+        snapshot = {'format': DefinitionCache.FORMAT, 'version': DefinitionCache.VERSION,
+                    'sha256': DefinitionCache._checksum(records), 'entries': records}
+        data = json.dumps(snapshot, ensure_ascii=False, separators=(',', ':')).encode("utf-8")
+        temp_path = path + ".tmp"
+        with self.__save_lock:
+            with open(temp_path, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as file:
+                file.write(data)
+            os.replace(temp_path, path)
+
+    def __len__(self):
+        with self.__lock:
+            return len(self.__entries)
+
+    def __contains__(self, word):
+        with self.__lock:
+            return word in self.__entries
+
+    def _merge_entries(self, entries):
+        """Yields True for every (word, entry) pair, which changed the cache, and False for the others"""
+        with self.__lock:
+            for word, entry in entries:
+                yield self._merge_entry(word, entry)
+
+    def _merge_entry(self, word, entry):
+        """Keeps the newer of the cached and the given entry. Returns True, if the given one was taken"""
+        old = self.__entries.get(word)
+        if old is not None and (old[2], old[3]) >= (entry[2], entry[3]):
+            return False
+        self.__entries[word] = (entry[0], list(entry[1]), entry[2], entry[3])
+        return True
+
+    @staticmethod
+    def _checksum(records):
+        """Returns the SHA-256 of the canonical JSON of the records"""
+        data = json.dumps(records, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
@@ -0,0 +1,235 @@
+"""Compact storage of big word and definition lists"""
+
+from array import array
+from collections.abc import Sequence
+
+
+class CompactStrings(Sequence):
+    """
+    A list of strings (or None), which keeps the UTF-8 text of the items one after another in a buffer and the ends of
+    the items in an array of offsets, so an item costs its bytes and 8 bytes of offsets instead of a str object and a
+    list slot. An item is decoded only when it's accessed
+
+    A slice shares the buffer, so slicing copies only the offsets. With intern=True the equal items are stored once
+    (e.g. "Not found" of many rows), and every item has the index of its text in another array
+    """
+
+    def __init__(self, values=(), intern=False):
+        """
+        Inputs:
+        values (iterable): the strings or None
+        intern (bool): stores the equal items once
+        """
+        self.__data = bytearray()
+        # The text number k is data[offsets[k]:offsets[k + 1]]. Without interning the text number i is the item i
+        self.__offsets = array('Q', [0])
+        self.__items = array('Q') if intern else None
+        self.__interned = {} if intern else None
+        # A flag per item, which is 1 for None. Is created with the first None
+        self.__nones = None
+        self.__length = 0
+        # A slice, which shares the buffer, copies its text, before it's appended to
+        self.__shared = False
+        self.extend(values)
+
+    @classmethod
+    def _view(cls, data, offsets, items, interned, nones, length, shared):
+        """Returns the strings with the given parts of other strings"""
+        strings = cls.__new__(cls)
+        strings.__data = data
+        strings.__offsets = offsets
+        strings.__items = items
+        strings.__interned = interned
+        strings.__nones = nones
+        strings.__length = length
+        strings.__shared = shared
+        return strings
+
+    def append(self, value):
+        """Appends a string or None"""
+        if self.__shared:
+            self._unshare()
+        if value is None:
+            if self.__nones is None:
+                self.__nones = bytearray(self.__length)
+            self.__nones.append(1)
+            if self.__items is None:
+                self.__offsets.append(self.__offsets[-1])
+            else:
+                self.__items.append(0)
+            self.__length += 1
+            return
+
+        if self.__nones is not None:
+            self.__nones.append(0)
+        encoded = value.encode('utf-8')
+        if self.__items is None:
+            self._add_text(encoded)
+        else:
+            key = hash(value)
+            k = self.__interned.get(key)
+            if k is None or self.__data[self.__offsets[k]:self.__offsets[k + 1]] != encoded:
+                # A string with the same hash keeps its place, and this one is stored on its own
+                k = self._add_text(encoded)
+                self.__interned.setdefault(key, k)
+            self.__items.append(k)
+        self.__length += 1
+
+    def extend(self, values):
+        """Appends every string or None of an iterable"""
+        for value in values:
+            self.append(value)
+
+    def encoded(self, i):
+        """Returns the UTF-8 bytes of an item without decoding it, or None"""
+        k = self._text(i)
+        return None if k is None else bytes(self.__data[self.__offsets[k]:self.__offsets[k + 1]])
+
+    def tolist(self):
+        """Returns a list with the decoded items"""
+        return list(self)
+
+    @property
+    def nbytes(self):
+        """The bytes of the buffer, the offsets and the flags. A slice shares the buffer of its source"""
+        n = len(self.__data) + self.__offsets.itemsize * len(self.__offsets)
+        if self.__items is not None:
+            n += self.__items.itemsize * len(self.__items)
+        return n + (len(self.__nones) if self.__nones is not None else 0)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self._slice(i)
+        k = self._text(i)
+        return None if k is None else self.__data[self.__offsets[k]:self.__offsets[k + 1]].decode('utf-8')
+
+    def __iter__(self):
+        data, offsets, items, nones = self.__data, self.__offsets, self.__items, self.__nones
+        for i in range(self.__length):
+            if nones is not None and nones[i]:
+                yield None
+                continue
+            k = items[i] if items is not None else i
+            yield data[offsets[k]:offsets[k + 1]].decode('utf-8')
+
+    def __len__(self):
+        return self.__length
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self):
+        return f"CompactStrings({self.tolist()!r})"
+
+    def _text(self, i):
+        """Returns the index of the text of the item i, or None if the item is None. Raises IndexError"""
+        if i < 0:
+            i += self.__length
+        if not 0 <= i < self.__length:
+            raise IndexError("CompactStrings index out of range")
+        if self.__nones is not None and self.__nones[i]:
+            return None
+        return self.__items[i] if self.__items is not None else i
+
+    def _add_text(self, encoded):
+        """Appends a text to the buffer and returns its index"""
+        self.__data += encoded
+        self.__offsets.append(len(self.__data))
+        return len(self.__offsets) - 2
+
+    def _slice(self, i):
+        """Returns the items of a slice, which share the buffer"""
+        indices = range(self.__length)[i]
+        nones = self.__nones[i] if self.__nones is not None else None
+        if self.__items is not None:
+            # Interned strings only ever add texts, so every slice can keep adding to the same buffer
+            return CompactStrings._view(self.__data, self.__offsets, self.__items[i], self.__interned, nones,
+                                        len(indices), False)
+        if indices.step != 1:
+            return CompactStrings(self[j] for j in indices)
+        offsets = self.__offsets[indices.start:indices.stop + 1] if indices else array('Q', [0])
+        return CompactStrings._view(self.__data, offsets, None, None, nones, len(indices), True)
+
+    def _unshare(self):
+        """Copies the text of a slice into a buffer of its own, so it can be appended to"""
+        base = self.__offsets[0]
+        self.__data = self.__data[base:self.__offsets[-1]]
+        self.__offsets = array('Q', (offset - base for offset in self.__offsets))
+        self.__shared = False
+
+
+class CompactPairs(Sequence):
+    """
+    A list of (word, definition) tuples, which keeps the words and the definitions in two CompactStrings. A row is a
+    tuple, when it's accessed, and a slice is a CompactPairs, which shares the buffers
+    """
+
+    def __init__(self, rows=(), intern=False):
+        """
+        Inputs:
+        rows (iterable): the (word, definition) tuples
+        intern (bool): stores the equal definitions once
+        """
+        self.__words = CompactStrings()
+        self.__definitions = CompactStrings(intern=intern)
+        self.extend(rows)
+
+    @classmethod
+    def from_columns(cls, words, definitions):
+        """Returns the rows of two CompactStrings of the same length without copying them"""
+        assert len(words) == len(definitions), "Every word should have a definition"
+        pairs = cls.__new__(cls)
+        pairs.__words = words
+        pairs.__definitions = definitions
+        return pairs
+
+    @property
+    def words(self):
+        """The CompactStrings of the words"""
+        return self.__words
+
+    @property
+    def definitions(self):
+        """The CompactStrings of the definitions"""
+        return self.__definitions
+
+    @property
+    def nbytes(self):
+        """The bytes of the words and the definitions"""
+        return self.__words.nbytes + self.__definitions.nbytes
+
+    def append(self, row):
+        """Appends a (word, definition) tuple"""
+        word, definition = row
+        self.__words.append(word)
+        self.__definitions.append(definition)
+
+    def extend(self, rows):
+        """Appends every (word, definition) tuple of an iterable"""
+        for row in rows:
+            self.append(row)
+
+    def tolist(self):
+        """Returns a list with the (word, definition) tuples"""
+        return list(self)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return CompactPairs.from_columns(self.__words[i], self.__definitions[i])
+        return self.__words[i], self.__definitions[i]
+
+    def __iter__(self):
+        return zip(self.__words, self.__definitions)
+
+    def __len__(self):
+        return len(self.__words)
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == tuple(b) for a, b in zip(self, other))
+
+    def __repr__(self):
+        return f"CompactPairs({self.tolist()!r})"
@@ -0,0 +1,823 @@
+"""Interaction with the Quizlet website through a Chrome webdriver"""
+
+import os
+import re
+import time
+from array import array
+from contextlib import nullcontext
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import ElementClickInterceptedException, ElementNotInteractableException, \
+    NoSuchElementException, StaleElementReferenceException, TimeoutException, WebDriverException
+
+from .compact import CompactStrings
+from .locators import ElementCache, Locators
+from .settings import Settings
+from .words import del_duplicates, diff_rows, to_import_text
+
+# The heavy parts of selenium (the webdriver package with every browser, waits and expected conditions) are imported
+# on first use, so importing the core doesn't pay for them.
+
+
+class elements_have_error(object):
+    """
+    An expectation that either of the label elements have an error
+
+    Returns the element and False if neither has an error
+    """
+
+    def __init__(self, locator):
+        """Locator (tuple) - used to find the elements. Example: (By.XPATH, "//form[@class=LoginForm]")"""
+        self.locator = locator
+
+    def __call__(self, driver):
+        elements = driver.find_elements(*self.locator)
+        for el in elements:
+            if el.get_attribute("aria-invalid") == 'true':
+                return el
+        return False
+
+
+class login_outcome(object):
+    """
+    An expectation that a log in attempt has an outcome. Whichever of the following happens first decides it: the
+    browser is redirected to the success page, either of the labels of the log in form has an error or the form is
+    closed
+
+    Returns 'redirected', 'error' or 'closed' and False while there is no outcome
+    """
+
+    def __init__(self, success_url, form_locator, labels_locator):
+        """
+        Inputs:
+        success_url (str): the page, which a successful log in redirects to
+        form_locator, labels_locator (tuple): used to find the log in form and its labels
+        """
+        self.success_url = success_url
+        self.form_locator = form_locator
+        self.labels_locator = labels_locator
+
+    def __call__(self, driver):
+        if driver.current_url == self.success_url:
+            return 'redirected'
+        try:
+            forms = driver.find_elements(*self.form_locator)
+            if not forms or not forms[0].is_displayed():
+                return 'closed'
+            if elements_have_error(self.labels_locator)(driver):
+                return 'error'
+        except StaleElementReferenceException:
+            # The page is being replaced, so the next poll sees the new one
+            pass
+        return False
+
+
+# Resolves with the auto-suggested definitions of a term row, as soon as the suggestions container of the row shows at
+# least one definition, which is not in the old ones. Resolves with null after the timeout (ms)
+WAIT_FOR_SUGGESTIONS_SCRIPT = """
+var row = arguments[0], selector = arguments[1], oldDefs = arguments[2], timeout = arguments[3];
+var done = arguments[arguments.length - 1];
+var observer = null, timer = null;
+
+function check() {
+    var container = row.querySelector(selector);
+    if (container === null || container.innerText === '') {
+        return false;
+    }
+    var defs = container.innerText.split('\\n');
+    if (!defs.some(function (d) { return oldDefs.indexOf(d) < 0; })) {
+        return false;
+    }
+    if (observer !== null) {
+        observer.disconnect();
+        clearTimeout(timer);
+    }
+    done(defs);
+    return true;
+}
+
+if (!check()) {
+    observer = new MutationObserver(check);
+    observer.observe(row, {childList: true, subtree: true, characterData: true});
+    timer = setTimeout(function () { observer.disconnect(); done(null); }, timeout);
+}
+"""
+
+# The same for several term rows at once. Resolves with a list of [row index, definitions] of every row, which shows
+# new definitions, as soon as there is at least one. Resolves with an empty list after the timeout (ms)
+WAIT_FOR_ANY_SUGGESTIONS_SCRIPT = """
+var rows = arguments[0], selector = arguments[1], oldDefs = arguments[2], timeout = arguments[3];
+var done = arguments[arguments.length - 1];
+var observer = null, timer = null;
+
+function newDefs(i) {
+    var container = rows[i].querySelector(selector);
+    if (container === null || container.innerText === '') {
+        return null;
+    }
+    var defs = container.innerText.split('\\n');
+    if (!defs.some(function (d) { return oldDefs[i].indexOf(d) < 0; })) {
+        return null;
+    }
+    return defs;
+}
+
+function check() {
+    var ready = [];
+    for (var i = 0; i < rows.length; i++) {
+        var defs = newDefs(i);
+        if (defs !== null) {
+            ready.push([i, defs]);
+        }
+    }
+    if (ready.length === 0) {
+        return false;
+    }
+    if (observer !== null) {
+        observer.disconnect();
+        clearTimeout(timer);
+    }
+    done(ready);
+    return true;
+}
+
+if (!check()) {
+    observer = new MutationObserver(check);
+    for (var i = 0; i < rows.length; i++) {
+        observer.observe(rows[i], {childList: true, subtree: true, characterData: true});
+    }
+    timer = setTimeout(function () { observer.disconnect(); done([]); }, timeout);
+}
+"""
+
+
+class WebDriver:
+    """Interacts with the Quizlet"""
+    SUCCESSFUL_LOGIN_PAGE = 'https://quizlet.com/latest'
+    NEW_QUIZ_PAGE = 'https://quizlet.com/create-set'
+    EDIT_QUIZ_PAGE = 'https://quizlet.com/{}/edit'
+    SET_PAGE = 'https://quizlet.com/{}'
+    WEBSITE_PAGE = 'https://quizlet.com/'
+    # The outcome of a log in is polled often, so a successful log in takes as long as the site does
+    LOG_IN_POLL_FREQUENCY = 0.05
+
+    def __init__(self, tracer=None, driver=None, recorder=None, base_url=None, settings=None):
+        """
+        Inputs:
+        tracer (CommandTracer): records every command sent to the browser. Nothing is recorded if None
+        driver (selenium.webdriver.Remote): an already started driver. A Chrome driver is started if None
+        recorder (CommandRecorder): records the commands with their responses for an offline replay, if given
+        base_url (str): the address of a site, which stands in for quizlet.com (e.g. http://127.0.0.1:8080/).
+            quizlet.com is used if None
+        settings (Settings): the timeouts and the other performance settings. Are loaded from the settings file if None
+        """
+        if settings is None:
+            settings = Settings()
+            settings.load_file()
+        self.__settings = settings
+        if driver is None:
+            driver = WebDriver._start_chrome(settings.headless)
+        self.__driver = driver
+        self.__base_url = base_url.rstrip('/') + '/' if base_url else WebDriver.WEBSITE_PAGE
+        if recorder is not None:
+            recorder.attach(self.__driver)
+        self.__tracer = tracer
+        if tracer is not None:
+            tracer.attach(self.__driver)
+        self.__window_handle = self.__driver.current_window_handle
+        self.__elements = ElementCache(self.__driver)
+        self.__login_latency = None
+        self.__implicit_wait = 0
+
+    @staticmethod
+    def _start_chrome(headless=False):
+        """Starts a Chrome driver"""
+        from selenium import webdriver
+        from selenium.webdriver import ChromeOptions
+
+        # Log in button isn't clickable in headless mode on quizlet.com, so it's off by default
+        chrome_options = ChromeOptions()
+        chrome_options.headless = headless
+        chrome_options.set_capability('unhandledPromptBehavior', 'accept')
+        driver_path = os.path.join(os.path.curdir, "chromedriver.exe")
+        return webdriver.Chrome(driver_path, options=chrome_options)
+
+    @classmethod
+    def replay(cls, path, time_scale=1.0, tracer=None):
+        """
+        Returns a WebDriver, which is served by a recording of CommandRecorder instead of a browser
+
+        Inputs:
+        path (str): the JSON file with the recording
+        time_scale (float): the factor of the recorded durations. 0 replays without any waiting
+        tracer (CommandTracer): records every replayed command, if given
+        """
+        from selenium.webdriver import Remote
+        from .replay import ReplayExecutor
+        return cls(tracer, Remote(command_executor=ReplayExecutor(path, time_scale)), settings=Settings())
+
+    def _operation(self, name, **args):
+        """Returns a context, which attributes the sent commands to an operation, if the webdriver is traced"""
+        if self.__tracer is None:
+            return nullcontext({})
+        return self.__tracer.operation(name, **args)
+
+    def get_settings(self):
+        """Returns the settings, which the webdriver runs with"""
+        return self.__settings
+
+    def get_login_latency(self):
+        """Returns the seconds between the click on the log in button and the outcome of the last log in or None"""
+        return self.__login_latency
+
+    def _wait(self, timeout, poll_frequency=None):
+        """Returns a WebDriverWait with the given timeout and poll frequency. The one of the settings by default"""
+        from selenium.webdriver.support.ui import WebDriverWait
+        return WebDriverWait(self.__driver, timeout, poll_frequency or self.__settings.poll_frequency)
+
+    def _implicitly_wait(self, seconds):
+        """Sets the implicit wait of the driver and remembers it, since selenium can't tell it"""
+        self.__driver.implicitly_wait(seconds)
+        self.__implicit_wait = seconds
+
+    def _page(self, url):
+        """Returns the address of a Quizlet page on the site, which the webdriver works with"""
+        return self.__base_url + url[len(WebDriver.WEBSITE_PAGE):]
+
+    def _restore_window(self):
+        """Properly deiconifies the webdriver"""
+        self.__driver.switch_to.window(self.__window_handle)
+        self.__driver.set_window_rect(0, 0)
+
+    def log_in(self, username, password) -> bool:
+        """Tries to log in with the given userdata and returns True if successful. False otherwise."""
+        try:
+            with self._operation('log_in') as args:
+                self._navigate_to_log_in_form()
+                username_entry, password_entry, log_in_btn = self._get_log_in_elements()
+                username_entry.send_keys(username)
+                password_entry.send_keys(password)
+                self.__login_latency = None
+                t0 = time.perf_counter()
+                log_in_btn.click()
+                successful = self._is_successful()
+                self.__login_latency = args['latency'] = time.perf_counter() - t0
+                return successful
+        except (NoSuchElementException, ElementClickInterceptedException, TimeoutException) as e:
+            pass
+
+    def upload_quiz(self, quiz_name: str, quiz_description: str, words_and_definitions, import_mode=False):
+        """
+        Uploads a quiz with a given name/description and terms to the website. Returns the id of the new set
+
+        If import_mode is True, all terms are pasted into the import box at once instead of being typed card by card
+        """
+        with self._operation('upload_quiz', cards=len(words_and_definitions)):
+            return self._upload_quiz(quiz_name, quiz_description, words_and_definitions, import_mode)
+
+    def _upload_quiz(self, quiz_name, quiz_description, words_and_definitions, import_mode):
+        """Uploads a quiz. See upload_quiz"""
+        # Navigate to a new set
+        self._navigate_to_new_set()
+
+        # Get quiz_name/descr text entries, insert given arguments
+        quiz_name_e, quiz_descr_e = self._get_quiz_entries()
+        quiz_name_e.send_keys(quiz_name)
+        quiz_descr_e.send_keys(quiz_description)
+
+        if import_mode:
+            self._import_terms(words_and_definitions)
+        else:
+            # Get all entries, clear them
+            term_entries = self._get_term_entries(len(words_and_definitions))
+
+            # Insert words into entries
+            for i in range(len(words_and_definitions)):
+                with self._operation('upload_card', index=i):
+                    w_e, d_e = term_entries[i]
+                    word, definition = words_and_definitions[i]
+                    w_e.send_keys(word)
+                    d_e.send_keys(definition)
+
+        set_id = self._submit_set(Locators.CREATE_SET_BUTTON)
+        print('Uploaded', quiz_name, quiz_description, *words_and_definitions)
+        return set_id
+
+    def sync_quiz(self, set_id, quiz_name: str, quiz_description: str, old_words_and_definitions,
+                  words_and_definitions):
+        """
+        Updates an already uploaded set, so it has the given name/description and terms. Only the rows, which differ
+        from old_words_and_definitions (the content of the last upload), are touched. Returns the id of the set
+
+        If the edit page doesn't show the rows of the last upload (e.g. the set was edited on the site), the set is
+        left as it is, and the terms are uploaded as a new set. The id of the new set is returned then
+        """
+        with self._operation('sync_quiz', cards=len(words_and_definitions)):
+            return self._sync_quiz(set_id, quiz_name, quiz_description, old_words_and_definitions,
+                                   words_and_definitions)
+
+    def _sync_quiz(self, set_id, quiz_name, quiz_description, old_words_and_definitions, words_and_definitions):
+        """Updates an uploaded set. See sync_quiz"""
+        removed, inserted, changed = diff_rows(old_words_and_definitions, words_and_definitions)
+        self._navigate_to_edit_set(set_id)
+
+        # The rows are edited by their indices in the last upload, so a set, which differs from it, would lose the
+        # wrong cards
+        term_rows = self.__elements.find_all(Locators.TERM_ROWS)
+        if len(term_rows) != len(old_words_and_definitions) or any(
+                self.__elements.find(Locators.TERM_ENTRY, term_rows[i]).text != old_words_and_definitions[i][0]
+                for i in removed):
+            return self._upload_quiz(quiz_name, quiz_description, words_and_definitions, import_mode=True)
+
+        quiz_name_e, quiz_descr_e = self._get_quiz_entries()
+        quiz_name_e.send_keys(quiz_name)
+        quiz_descr_e.send_keys(quiz_description)
+
+        # Rows are deleted from the last one, so the indices of the remaining ones don't shift
+        for i in removed:
+            self.__elements.find(Locators.DELETE_CARD_BUTTON, term_rows[i]).click()
+        if removed:
+            self.__elements.invalidate()
+
+        # Empty rows are inserted from the first one, so every row gets its final position
+        n_rows = len(old_words_and_definitions) - len(removed)
+        for i, _, _ in inserted:
+            self._insert_card(i, n_rows)
+            n_rows += 1
+
+        term_entries = self._get_term_entries(len(words_and_definitions))
+        for i, word, definition in inserted:
+            with self._operation('upload_card', index=i):
+                w_e, d_e = term_entries[i]
+                w_e.send_keys(word)
+                d_e.send_keys(definition)
+        for i, word, definition in changed:
+            with self._operation('upload_card', index=i):
+                w_e, d_e = term_entries[i]
+                self._clear_text_entry(w_e)
+                self._clear_text_entry(d_e)
+                w_e.send_keys(word)
+                d_e.send_keys(definition)
+
+        self._submit_set(Locators.SAVE_SET_BUTTON)
+        return set_id
+
+    def _insert_card(self, index, n_rows):
+        """Inserts an empty card, so it has the given index in a set with n_rows cards"""
+        if index >= n_rows:
+            self._get_term_entries(n_rows + 1)
+            return
+        term_row = self.__elements.find_all(Locators.TERM_ROWS)[index]
+        self.__elements.find(Locators.INSERT_CARD_BUTTON, term_row).click()
+        for locator in (Locators.TERM_ROWS, Locators.TERM_ENTRY, Locators.DEFINITION_ENTRY):
+            self.__elements.forget(locator)
+
+    def _navigate_to_log_in_form(self):
+        """Navigates the webdriver to the log in form"""
+        from selenium.webdriver.support import expected_conditions as EC
+        self.__driver.get(self._page(WebDriver.WEBSITE_PAGE))
+        self.__elements.invalidate()
+        self._restore_window()
+        wait = self._wait(self.__settings.wait_timeout)
+        log_in_el = wait.until(EC.element_to_be_clickable(Locators.LOG_IN_BUTTON), "Log in button is not clickable")
+        log_in_el.click()
+
+    def _navigate_to_new_set(self):
+        """Navigates the webdriver to the new set page"""
+        self.__driver.get(self._page(WebDriver.NEW_QUIZ_PAGE))
+        self.__elements.invalidate()
+        self._restore_window()
+        try:
+            self._implicitly_wait(self.__settings.notification_timeout)
+            self.__driver.find_element(*Locators.NOTIFICATION_BUTTON).click()
+            try:
+                self._implicitly_wait(self.__settings.notification_timeout)
+                self.__driver.find_element(*Locators.REVERT_BUTTON).click()
+            except NoSuchElementException:
+                pass
+        except NoSuchElementException:
+            pass
+        # Reverting the draft re-renders the form
+        self.__elements.invalidate()
+
+    def _navigate_to_edit_set(self, set_id):
+        """Navigates the webdriver to the edit page of an uploaded set"""
+        self.__driver.get(self._page(WebDriver.EDIT_QUIZ_PAGE.format(set_id)))
+        self.__elements.invalidate()
+        self._restore_window()
+
+    def _submit_set(self, button_locator):
+        """Clicks the create/save button of a set form and returns the id of the set from the page it redirects to"""
+        from selenium.webdriver.support import expected_conditions as EC
+        form_url = self.__driver.current_url
+        wait = self._wait(self.__settings.wait_timeout)
+        wait.until(EC.element_to_be_clickable(button_locator)).click()
+        wait.until(EC.url_changes(form_url))
+        self.__elements.invalidate()
+        match = re.search(re.escape(urlparse(self.__base_url).netloc) + r"/(\d+)", self.__driver.current_url)
+        return match.group(1) if match else None
+
+    def _import_terms(self, words_and_definitions):
+        """Fills the set form with all words and definitions through the import box in one paste"""
+        from selenium.webdriver.support import expected_conditions as EC
+        wait = self._wait(self.__settings.wait_timeout)
+        wait.until(EC.element_to_be_clickable(Locators.IMPORT_BUTTON)).click()
+        import_area = wait.until(EC.visibility_of_element_located(Locators.IMPORT_TEXTAREA))
+
+        # send_keys would type the text key by key, so the value is set directly. The native setter and the input event
+        # let the page's React state see the new value
+        self.__driver.execute_script(
+            "var setter = Object.getOwnPropertyDescriptor(HTMLTextAreaElement.prototype, 'value').set;"
+            "setter.call(arguments[0], arguments[1]);"
+            "arguments[0].dispatchEvent(new Event('input', {bubbles: true}));",
+            import_area, to_import_text(words_and_definitions)
+        )
+        wait.until(EC.element_to_be_clickable(Locators.IMPORT_SUBMIT_BUTTON)).click()
+        self.__elements.invalidate()
+
+    def _get_log_in_elements(self):
+        """
+        Returns the elements of the log-in form in a tuple with the following indices
+
+        0 - username_entry
+        1 - password_entry
+        2 - log_in_btn
+        """
+        from selenium.webdriver.support import expected_conditions as EC
+
+        login_form = self.__elements.find(Locators.LOG_IN_FORM)
+        username_entry = self.__elements.find(Locators.USERNAME_ENTRY, login_form)
+        password_entry = self.__elements.find(Locators.PASSWORD_ENTRY, login_form)
+
+        wait = self._wait(self.__settings.wait_timeout)
+        log_in_btn = wait.until(EC.element_to_be_clickable(Locators.LOG_IN_FORM_BUTTON))
+        return username_entry, password_entry, log_in_btn
+
+    def _is_successful(self):
+        """Returns True, if login was successful. False otherwise. Returns as soon as the log in has an outcome"""
+        success_url = self._page(WebDriver.SUCCESSFUL_LOGIN_PAGE)
+        wait = self._wait(self.__settings.log_in_timeout, WebDriver.LOG_IN_POLL_FREQUENCY)
+        # The form is gone after the redirect, so an implicit wait of an earlier lookup would delay every poll by it
+        implicit_wait = self.__implicit_wait
+        self._implicitly_wait(0)
+        try:
+            outcome = wait.until(login_outcome(success_url, Locators.LOG_IN_FORM, Locators.LOG_IN_FORM_LABELS))
+            return outcome != 'error'
+        except TimeoutException:
+            return self.__driver.current_url == success_url
+        finally:
+            self._implicitly_wait(implicit_wait)
+
+    def _clear_text_entry(self, text_entry):
+        """Clears the text in an text entry element"""
+        from selenium.webdriver.common.keys import Keys
+        while text_entry.text != '':
+            try:
+                text_entry.click()
+                text_entry.send_keys(Keys.CONTROL + "a")
+                text_entry.send_keys(Keys.DELETE)
+                self._implicitly_wait(1)
+            except ElementClickInterceptedException:
+                pass
+
+    def _get_quiz_entries(self):
+        """Returns a tuple with name and description entries after clearing them"""
+        elements_holder = self.__elements.find(Locators.QUIZ_HEADER)
+        name_e = self.__elements.find(Locators.QUIZ_NAME_ENTRY, elements_holder)
+        descr_e = self.__elements.find(Locators.QUIZ_DESCRIPTION_ENTRY, elements_holder)
+        name_e.clear()
+        descr_e.clear()
+        return name_e, descr_e
+
+    def _get_term_entries(self, n):
+        """Returns a list of n tuples with term and definition entry"""
+        from selenium.webdriver.support import expected_conditions as EC
+        wait = self._wait(self.__settings.add_card_timeout)
+
+        # Creating additional entries, if needed. A click normally adds one row, so the rows are counted instead of
+        # being queried again after each click. The rows are queried once after the clicks, and the missing ones are
+        # added in another round
+        for _ in range(3):
+            n_rows = len(self.__elements.find_all(Locators.TERM_ROWS))
+            if n_rows >= n:
+                break
+            add_card_btn = wait.until(EC.element_to_be_clickable(Locators.ADD_CARD_BUTTON))
+            delay = 0.1
+            while n_rows < n:
+                try:
+                    add_card_btn.click()
+                    n_rows += 1
+                    delay = 0.1
+                except ElementClickInterceptedException:
+                    # Something covers the button for a moment (e.g. a notification), so the click is retried later
+                    if delay > 2:
+                        raise
+                    time.sleep(delay)
+                    delay *= 2
+            for locator in (Locators.TERM_ROWS, Locators.TERM_ENTRY, Locators.DEFINITION_ENTRY):
+                self.__elements.forget(locator)
+
+        # Adding tuples with entries to the list. The editors of every row are collected with two document-wide
+        # queries instead of two queries per row
+        term_entries = [t for t in zip(
+            self.__elements.find_all(Locators.TERM_ENTRY),
+            self.__elements.find_all(Locators.DEFINITION_ENTRY)
+        )]
+        assert len(term_entries) >= n, f"The form has {len(term_entries)} cards instead of {n}"
+
+        return term_entries
+
+    def _get_definition_elements(self):
+        """
+        Returns first row elements in a tuple
+
+        0 - term_row_wrap
+        1 - word_entry
+        2 - definition_entry
+        """
+        term_row_wrap = self.__elements.find(Locators.FIRST_TERM_ROW)
+        word_entry = self.__elements.find(Locators.TERM_ENTRY, Locators.FIRST_TERM_ROW)
+        definition_entry = self.__elements.find(Locators.DEFINITION_ENTRY, Locators.FIRST_TERM_ROW)
+        return term_row_wrap, word_entry, definition_entry
+
+    def _wait_for_suggestions(self, term_row, old_defs, timeout=None):
+        """
+        Waits inside the page until the row shows auto-suggested definitions, which differ from old_defs, and returns
+        them in a list. Returns None, if nothing new was suggested within timeout seconds (suggestion_timeout of the
+        settings if None)
+
+        Unlike polling the suggestions element, the page reports the change itself, so the whole wait costs a single
+        round trip. The script timeout of the driver has to be longer than timeout.
+        """
+        if timeout is None:
+            timeout = self.__settings.suggestion_timeout
+        return self.__driver.execute_async_script(WAIT_FOR_SUGGESTIONS_SCRIPT, term_row,
+                                                  Locators.AUTO_SUGGESTIONS[1], list(old_defs), int(timeout * 1000))
+
+    def _wait_for_any_suggestions(self, term_rows, old_defs, timeout=None):
+        """
+        Waits inside the page until at least one of the rows shows auto-suggested definitions, which differ from the
+        old_defs of that row, and returns a list of (row number, definitions) of every such row. Returns an empty list,
+        if nothing new was suggested within timeout seconds (suggestion_timeout of the settings if None)
+        """
+        if timeout is None:
+            timeout = self.__settings.suggestion_timeout
+        ready = self.__driver.execute_async_script(WAIT_FOR_ANY_SUGGESTIONS_SCRIPT, list(term_rows),
+                                                   Locators.AUTO_SUGGESTIONS[1], [list(d) for d in old_defs],
+                                                   int(timeout * 1000))
+        return [(i, defs) for i, defs in ready or []]
+
+    def _del_duplicates(self, words):
+        """Deletes duplicate strings from words list"""
+        del_duplicates(words)
+
+    def iter_definitions(self, words, pipeline=1, cache=None, flights=None):
+        """
+        Yields a tuple (word, definition, candidates) for each unique word in words as soon as its lookup is done.
+        The definition is the longest auto-suggested one or None, if there is no definition, and candidates is a list
+        with all suggested definitions.
+
+        Inputs:
+        words (iterable): an iterable with words
+        pipeline (int): the number of term rows, which look words up at once. With more than one row the results are
+            yielded in the order, in which the suggestions arrive
+        cache (DefinitionCache): the cached words are yielded first without a lookup, and the found definitions are
+            added to it. Isn't used if None
+        flights (SingleFlight): the lookups, which run at the same time. A word joins its flight right before it's
+            typed, and a word, which another lookup is busy with then, is yielded with the result of that lookup after
+            the other words instead of being looked up again. Isn't used if None
+
+        Raises NoSuchElementException, if the web elements of the set form could not be found
+        """
+        # Works, but the user must not interact with the browser (headless mode wouldn't allow this)
+        words = list(words)
+        # Delete all duplicates from words, but saves the order
+        self._del_duplicates(words)
+        for _, word, definition, candidates in self._iter_definitions(words, pipeline, cache, flights):
+            yield word, definition, candidates
+
+    def _iter_definitions(self, words, pipeline, cache, flights):
+        """
+        Yields a tuple (index, word, definition, candidates) of iter_definitions for each word of a list without
+        duplicates. The list isn't copied, and its words are kept track of by their index
+        """
+        # A flag per word, which is 1, when the word was yielded or another lookup is busy with it
+        done = bytearray(len(words))
+
+        if cache is not None:
+            for i, word in enumerate(words):
+                cached = cache.get(word)
+                if cached is not None:
+                    done[i] = 1
+                    yield (i, word, *cached)
+
+        # The running flights, which this lookup leads, and the flights of the other lookups, which it follows, by the
+        # index of the word
+        led, followed = {}, []
+
+        def claim(i):
+            """Joins the flight of a word right before it's typed. Returns False, if another lookup is busy with it"""
+            if flights is None or i in led:
+                return True
+            flight, leader = flights.join(words[i])
+            if leader:
+                led[i] = flight
+            else:
+                # The word is yielded after the lookup, when the other one has found it
+                done[i] = 1
+                followed.append((i, flight))
+            return leader
+
+        while 0 in done:
+            try:
+                for i, definition, candidates in self._look_up_definitions(words, done, pipeline, claim):
+                    if cache is not None and definition is not None:
+                        cache.put(words[i], definition, candidates)
+                    if i in led:
+                        flights.resolve(led.pop(i), (definition, candidates))
+                    yield i, words[i], definition, candidates
+            finally:
+                # The followers of a lookup, which failed or was stopped, look their words up themselves
+                for flight in led.values():
+                    flights.abandon(flight)
+                led.clear()
+
+            for i, flight in followed:
+                try:
+                    definition, candidates = flights.wait(flight)
+                except LookupError:
+                    done[i] = 0
+                    continue
+                yield i, words[i], definition, list(candidates)
+            followed.clear()
+
+    def _look_up_definitions(self, words, done, pipeline, claim):
+        """
+        Looks the words, whose flag in done is 0, up in the form and yields a tuple (index, definition, candidates)
+        for each of them. claim(index) is called right before a word is typed, and the word is skipped, if it returns
+        False. Sets the flag of every yielded word
+        """
+        while True:
+            try:
+                auto_defs = []
+
+                # Create a new quiz, find entries
+                self._navigate_to_new_set()
+                _, word_entry, definition_entry = self._get_definition_elements()
+                word_entry.clear()
+                definition_entry.clear()
+                # The script timeout of the driver has to be longer than the waits of the scripts
+                self.__driver.set_script_timeout(self.__settings.suggestion_timeout + 1)
+
+                if pipeline > 1:
+                    yield from self._iter_definitions_pipelined(words, done, pipeline, claim)
+                    return
+
+                # For each word, find an auto-suggested definition.
+                # The row re-renders now and then, so the elements are used through the cache, which re-resolves only
+                # the handles that went stale
+                row = Locators.FIRST_TERM_ROW
+                for i, word in enumerate(words):
+                    if done[i] or not claim(i):
+                        continue
+                    with self._operation('get_definitions', word=word):
+                        try:
+                            self.__elements.act(Locators.TERM_ENTRY, lambda e: e.send_keys(word), row)
+                            self.__elements.act(Locators.DEFINITION_ENTRY, lambda e: e.click(), row)
+                            new_defs = self.__elements.act(row, lambda e: self._wait_for_suggestions(e, auto_defs))
+                            if new_defs is None:
+                                raise TimeoutException(f"No new definitions were suggested for {word}")
+                            # Choose the longest proposed definition
+                            auto_defs = sorted(new_defs, key=len)
+                            result = (i, auto_defs[-1] if len(auto_defs) > 0 else None, list(auto_defs))
+                        except (NoSuchElementException, TimeoutException):
+                            result = (i, None, [])
+                        self.__elements.act(Locators.TERM_ENTRY, self._clear_text_entry, row)
+                    done[i] = 1
+                    yield result
+                return
+            except (ElementNotInteractableException, StaleElementReferenceException):
+                # The form is reopened and the lookup goes on with the words, which weren't yielded yet
+                self.__elements.invalidate()
+
+    def _iter_definitions_pipelined(self, words, done, n_rows, claim=None, timeout=None):
+        """
+        Looks the words, whose flag in done is 0, up in n_rows term rows at once and yields the results of
+        _look_up_definitions as the suggestions arrive. A row is refilled with the next word as soon as its word is
+        done, so the browser waits for several suggestions at a time instead of one. A word, which got no suggestions
+        within timeout seconds (suggestion_timeout of the settings if None), has no definition. Sets the flag of every
+        yielded word
+
+        claim(index) is called right before a word is typed into a free row, and the word is skipped, if it returns
+        False. Every word is typed if None
+        """
+        if timeout is None:
+            timeout = self.__settings.suggestion_timeout
+        self._get_term_entries(n_rows)
+        rows = [Locators.term_row(i) for i in range(n_rows)]
+        # The index of the word of every row with its deadline, or None, if the row is free
+        slots = [None] * n_rows
+        # Like in the single row lookup, a row has to show definitions, which differ from its last ones
+        old_defs = [[] for _ in range(n_rows)]
+        # The next word is taken (and claimed) only, when a row is free
+        pending = (i for i in range(len(words)) if not done[i] and (claim is None or claim(i)))
+        exhausted = False
+
+        while True:
+            for i, row in enumerate(rows):
+                if slots[i] is not None or exhausted:
+                    continue
+                index = next(pending, None)
+                if index is None:
+                    exhausted = True
+                    continue
+                self.__elements.act(Locators.TERM_ENTRY, lambda e: e.send_keys(words[index]), row)
+                self.__elements.act(Locators.DEFINITION_ENTRY, lambda e: e.click(), row)
+                slots[i] = (index, time.monotonic() + timeout)
+
+            busy = [i for i in range(n_rows) if slots[i] is not None]
+            if not busy:
+                return
+            wait = max(min(slots[i][1] for i in busy) - time.monotonic(), 0.05)
+            with self._operation('get_definitions', words=[words[slots[i][0]] for i in busy]):
+                ready = self._wait_for_any_suggestions([self.__elements.find(rows[i]) for i in busy],
+                                                       [old_defs[i] for i in busy], wait)
+
+            # Choose the longest proposed definition. The rows, which are out of time, have no definition
+            results = {}
+            for j, new_defs in ready:
+                i = busy[j]
+                old_defs[i] = sorted(new_defs, key=len)
+                results[i] = (slots[i][0], old_defs[i][-1] if len(old_defs[i]) > 0 else None, list(old_defs[i]))
+            now = time.monotonic()
+            for i in busy:
+                if i not in results and slots[i][1] <= now:
+                    results[i] = (slots[i][0], None, [])
+
+            for i, result in results.items():
+                self.__elements.act(Locators.TERM_ENTRY, self._clear_text_entry, rows[i])
+                slots[i] = None
+                done[result[0]] = 1
+                yield result
+
+    def get_definitions(self, words, pipeline=1, cache=None, flights=None):
+        """
+        Returns a CompactStrings with definitions for each unique word in words list. Appends None if there is no
+        definition. The definitions are kept compact while they arrive, so a big list doesn't hold a str object per
+        item
+
+        Inputs:
+        words (iterable): an iterable with words
+        pipeline (int): the number of term rows, which look words up at once (see iter_definitions)
+        cache (DefinitionCache): the cache of the found definitions (see iter_definitions)
+        flights (SingleFlight): the lookups, which run at the same time (see iter_definitions)
+
+        Output: a CompactStrings (a sequence like a list) with definitions in the order of the words.
+
+        Raises NoSuchElementException, if the web elements of the set form could not be found
+        """
+        words = list(words)
+        self._del_duplicates(words)
+        # The definitions in the order they arrive, and the index of the definition of every word in them. A word
+        # without a result gets the None at index 0
+        found = CompactStrings([None])
+        order = array('Q', [0]) * len(words)
+        in_order = True
+        for i, _, definition, _ in self._iter_definitions(words, pipeline, cache, flights):
+            in_order = in_order and i == len(found) - 1
+            order[i] = len(found)
+            found.append(definition)
+        # The words aren't needed to reorder the definitions
+        del words
+        if in_order and len(found) == len(order) + 1:
+            # A single row lookup without a cache finds the words in their order, so the definitions are kept as
+            # they are
+            return found[1:]
+        return CompactStrings(found[i] for i in order)
+
+    def is_alive(self):
+        """Returns True, if the browser still responds to the commands. False otherwise"""
+        try:
+            self.__driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def memory_usage(self):
+        """
+        Returns the resident memory (in bytes) of chromedriver and every browser process started by it. Returns None,
+        if the optional psutil package isn't installed or the processes are gone
+        """
+        try:
+            import psutil
+        except ImportError:
+            return None
+        try:
+            chromedriver = psutil.Process(self.__driver.service.process.pid)
+            processes = [chromedriver, *chromedriver.children(recursive=True)]
+            return sum(p.memory_info().rss for p in processes)
+        except (psutil.Error, AttributeError):
+            return None
+
+    def quit(self):
+        self.__driver.quit()
@@ -0,0 +1,93 @@
+"""Reading and writing the words and definitions in CSV, TSV and Anki files"""
+
+import csv
+import html
+import os
+import re
+
+# The extension of a file -> its format. Anki imports and exports its notes as plain text files
+FORMATS = {'.csv': 'csv', '.tsv': 'tsv', '.txt': 'anki'}
+
+# The header, which tells Anki how to import the file
+ANKI_HEADER = ('#separator:tab', '#html:true')
+
+_BR = re.compile(r'<br\s*/?>', re.IGNORECASE)
+
+
+def get_format(path):
+    """Returns the format of a file by its extension. Raises ValueError, if the extension isn't supported"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"File should be one of {', '.join(FORMATS)}, not {path}")
+    return FORMATS[extension]
+
+
+def read_rows(path, chunk_size=1000, fmt=None):
+    """
+    Yields the (word, definition) rows of a file in lists of up to chunk_size rows, so a big file is never loaded at
+    once. A row without a definition gets an empty one, and the empty lines are skipped
+
+    Inputs:
+    path (str): a CSV, TSV or Anki file
+    chunk_size (int): the number of rows in a chunk
+    fmt (str): 'csv', 'tsv' or 'anki'. Is chosen by the extension, if None
+    """
+    fmt = fmt or get_format(path)
+    with open(path, 'r', newline='', encoding='utf-8-sig') as file:
+        if fmt == 'anki':
+            reader = csv.reader((line for line in file if not line.startswith('#')), delimiter='\t')
+        else:
+            reader = csv.reader(file, delimiter=',' if fmt == 'csv' else '\t')
+        chunk = []
+        for fields in reader:
+            if not fields or not any(fields):
+                continue
+            word, definition = (fields + [''])[:2]
+            if fmt == 'anki':
+                word, definition = _from_anki(word), _from_anki(definition)
+            chunk.append((word, definition))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def write_rows(path, rows, chunk_size=1000, fmt=None):
+    """
+    Writes the (word, definition) rows into a file chunk by chunk and returns the number of written rows
+
+    Inputs:
+    path (str): a CSV, TSV or Anki file
+    rows (iterable): the (word, definition) tuples
+    chunk_size (int): the number of rows, which are written at once
+    fmt (str): 'csv', 'tsv' or 'anki'. Is chosen by the extension, if None
+    """
+    fmt = fmt or get_format(path)
+    n = 0
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file, delimiter=',' if fmt == 'csv' else '\t', lineterminator='\n')
+        if fmt == 'anki':
+            file.write('\n'.join(ANKI_HEADER) + '\n')
+        chunk = []
+        for word, definition in rows:
+            if fmt == 'anki':
+                word, definition = _to_anki(word), _to_anki(definition)
+            chunk.append((word, definition))
+            if len(chunk) >= chunk_size:
+                writer.writerows(chunk)
+                n += len(chunk)
+                chunk = []
+        writer.writerows(chunk)
+        n += len(chunk)
+    return n
+
+
+def _to_anki(text):
+    """Escapes a field for Anki, which reads the fields as HTML"""
+    return html.escape(str(text), quote=False).replace('\r\n', '<br>').replace('\n', '<br>')
+
+
+def _from_anki(text):
+    """Reverts _to_anki"""
+    return html.unescape(_BR.sub('\n', text))
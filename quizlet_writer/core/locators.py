@@ -0,0 +1,131 @@
+"""Locators of the Quizlet elements and a cache of the resolved elements"""
+
+from selenium.common.exceptions import StaleElementReferenceException
+
+
+# Same as selenium.webdriver.common.by.By.CSS_SELECTOR. By isn't imported, since importing it loads the whole
+# selenium.webdriver package
+CSS_SELECTOR = 'css selector'
+
+
+class Locators:
+    """CSS locators of the Quizlet elements, which are used by the WebDriver"""
+    LOG_IN_BUTTON = (CSS_SELECTOR, "div[class='SiteNavLoginSection'] > button[aria-label='Log in']")
+    LOG_IN_FORM = (CSS_SELECTOR, "form[class='LoginPromptModal-form']")
+    USERNAME_ENTRY = (CSS_SELECTOR, "input#username")
+    PASSWORD_ENTRY = (CSS_SELECTOR, "input#password")
+    LOG_IN_FORM_BUTTON = (CSS_SELECTOR, "form[class='LoginPromptModal-form'] button[aria-label='Log in']")
+    LOG_IN_FORM_LABELS = (CSS_SELECTOR, "form[class='LoginPromptModal-form'] "
+                                        "label[class='AssemblyInput AssemblyInput--filled']")
+
+    NOTIFICATION_BUTTON = (CSS_SELECTOR, "div[class='UINotification UINotification--default'] "
+                                         "button[class='UILink']")
+    REVERT_BUTTON = (CSS_SELECTOR, "button[class='UILink UILink--revert']")
+
+    QUIZ_HEADER = (CSS_SELECTOR, "div[class='CreateSetHeader-headingContent']")
+    QUIZ_NAME_ENTRY = (CSS_SELECTOR, "textarea[placeholder='Enter a title, like “Biology - Chapter 22: Evolution”']")
+    QUIZ_DESCRIPTION_ENTRY = (CSS_SELECTOR, "textarea[placeholder='Add a description...']")
+
+    TERM_ROWS = (CSS_SELECTOR, "div[class='TermRows-termRowWrap']")
+    FIRST_TERM_ROW = (CSS_SELECTOR, "div[class='TermRows'] > div > div[data-term-luid='term-0']")
+    ADD_CARD_BUTTON = (CSS_SELECTOR, "button[aria-label='+ Add card']")
+    TERM_ENTRY = (CSS_SELECTOR, "div[aria-labelledby='editor-term-side']")
+    DEFINITION_ENTRY = (CSS_SELECTOR, "div[aria-labelledby='editor-definition-side']")
+    AUTO_SUGGESTIONS = (CSS_SELECTOR, "div[class='AutosuggestContext-suggestions']")
+    DELETE_CARD_BUTTON = (CSS_SELECTOR, "button[aria-label='Delete this card']")
+    INSERT_CARD_BUTTON = (CSS_SELECTOR, "button[aria-label='Insert a card above']")
+    CREATE_SET_BUTTON = (CSS_SELECTOR, "button[aria-label='Create']")
+    SAVE_SET_BUTTON = (CSS_SELECTOR, "button[aria-label='Done']")
+    IMPORT_BUTTON = (CSS_SELECTOR, "button[aria-label='+ Import from Word, Excel, Google Docs, etc.']")
+    IMPORT_TEXTAREA = (CSS_SELECTOR, "div[class='ImportTerms'] textarea")
+    IMPORT_SUBMIT_BUTTON = (CSS_SELECTOR, "div[class='ImportTerms'] button[aria-label='Import']")
+
+    @staticmethod
+    def term_row(index):
+        """Returns the locator of the term row with the given index. term_row(0) is FIRST_TERM_ROW"""
+        return CSS_SELECTOR, f"div[class='TermRows'] > div > div[data-term-luid='term-{index}']"
+
+
+class ElementCache:
+    """
+    Resolves locators into web elements and caches the handles until the page changes
+
+    Cached handles are dropped on every navigation (see invalidate), so a lookup on an unchanged page costs no
+    WebDriver round trips. Staleness isn't checked ahead of time: act uses a cached handle directly and re-resolves
+    only the locator (and its parent locator), whose handle raised a StaleElementReferenceException.
+    """
+
+    def __init__(self, driver):
+        """
+        Inputs:
+        driver (selenium.webdriver.Remote): a driver, which is used to resolve the locators
+        """
+        self.__driver = driver
+        self.__elements = {}
+
+    def invalidate(self):
+        """Drops every cached handle. Has to be called after the page is changed"""
+        self.__elements.clear()
+
+    def forget(self, locator, parent=None):
+        """Drops the cached handles of the locator, e.g. after a StaleElementReferenceException"""
+        parent_key = self._parent_key(parent)
+        self.__elements.pop((locator, parent_key, False), None)
+        self.__elements.pop((locator, parent_key, True), None)
+
+    def find(self, locator, parent=None):
+        """
+        Returns the first element matching the locator. Raises NoSuchElementException, if there is no such element
+
+        Inputs:
+        locator (Tuple[str, str]): a locator tuple from Locators
+        parent (WebElement or Tuple[str, str]): an element or a locator of an element, which the search is scoped to.
+            The whole document is searched if None
+        """
+        key = (locator, self._parent_key(parent), False)
+        element = self.__elements.get(key)
+        if element is None:
+            element = self._resolve_parent(parent).find_element(*locator)
+            self.__elements[key] = element
+        return element
+
+    def find_all(self, locator, parent=None):
+        """Returns a list with all elements matching the locator. See find for the inputs"""
+        key = (locator, self._parent_key(parent), True)
+        elements = self.__elements.get(key)
+        if elements is None:
+            elements = self._resolve_parent(parent).find_elements(*locator)
+            self.__elements[key] = elements
+        return elements
+
+    def act(self, locator, action, parent=None):
+        """
+        Calls action with the element of the locator and returns its result. If the cached handle (or the handle of a
+        parent locator) went stale, they are resolved again and action is retried once
+
+        Inputs:
+        locator, parent: see find
+        action (callable): a function, which takes the element
+        """
+        try:
+            return action(self.find(locator, parent))
+        except StaleElementReferenceException:
+            self.forget(locator, parent)
+            if isinstance(parent, tuple):
+                self.forget(parent)
+            return action(self.find(locator, parent))
+
+    def _resolve_parent(self, parent):
+        """Returns the element, which a search is scoped to"""
+        if parent is None:
+            return self.__driver
+        if isinstance(parent, tuple):
+            return self.find(parent)
+        return parent
+
+    @staticmethod
+    def _parent_key(parent):
+        """Returns the part of a cache key, which identifies the parent"""
+        if parent is None or isinstance(parent, tuple):
+            return parent
+        return parent.id
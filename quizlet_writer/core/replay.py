@@ -0,0 +1,121 @@
+"""Recording of the webdriver commands on the real website and their offline replay"""
+
+import copy
+import json
+import threading
+import time
+
+FORMAT = 'quizlet-writer-replay'
+VERSION = 1
+
+# The session of a replay is created by the driver itself, so its parameters differ from the recorded ones
+NEW_SESSION = 'newSession'
+
+
+def _snapshot(value):
+    """Returns a JSON copy of a value. The driver changes the responses in place after they are returned"""
+    return json.loads(json.dumps(value, default=str))
+
+
+class CommandRecorder:
+    """
+    Records every command, which a webdriver sends to the browser, with its parameters, the response and the duration,
+    so a real get_definitions or upload_quiz run can be replayed offline with a ReplayExecutor
+
+    The responses hold everything the webdriver read from the pages (the texts, the urls, the suggested definitions).
+    If snapshots is True, the DOM of every page, which was navigated to, is stored as well for inspecting a replay.
+    """
+
+    def __init__(self, snapshots=False):
+        self.__commands = []
+        self.__snapshots = snapshots
+        self.__lock = threading.Lock()
+
+    def attach(self, driver):
+        """Starts recording the commands of a selenium driver by wrapping its command executor"""
+        executor = driver.command_executor
+        execute = executor.execute
+
+        # The session was created before the recorder was attached, so its response is made up from the driver
+        if getattr(driver, 'w3c', True):
+            response = {'value': {'sessionId': driver.session_id, 'capabilities': driver.capabilities}}
+        else:
+            response = {'status': 0, 'sessionId': driver.session_id, 'value': driver.capabilities}
+        self._add(NEW_SESSION, {}, response, 0)
+
+        def recorded_execute(command, params):
+            t0 = time.perf_counter()
+            response = execute(command, params)
+            record = self._add(command, params, response, time.perf_counter() - t0)
+            if self.__snapshots and command == 'get':
+                source = execute('getPageSource', {'sessionId': params.get('sessionId')})
+                record['snapshot'] = (source or {}).get('value')
+            return response
+
+        executor.execute = recorded_execute
+
+    def commands(self):
+        """Returns a list with the recorded commands"""
+        with self.__lock:
+            return list(self.__commands)
+
+    def save(self, path):
+        """Writes the recorded commands into a JSON file"""
+        with self.__lock:
+            fixture = {'format': FORMAT, 'version': VERSION, 'commands': list(self.__commands)}
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(fixture, file, ensure_ascii=False)
+
+    def _add(self, command, params, response, duration):
+        """Appends a command to the recording and returns its record"""
+        record = {'command': command, 'params': _snapshot(params), 'response': _snapshot(response),
+                  'duration': duration}
+        with self.__lock:
+            self.__commands.append(record)
+        return record
+
+
+class ReplayExecutor:
+    """
+    A command executor, which serves the responses of a recording instead of a browser. Pass it as the
+    command_executor of selenium.webdriver.Remote (or use WebDriver.replay)
+
+    The commands have to come in the recorded order with the recorded parameters, otherwise ValueError is raised, so a
+    replay either follows the recorded run exactly or fails. Every response is delayed by the recorded duration times
+    time_scale. 0 replays without any waiting.
+    """
+
+    def __init__(self, path, time_scale=1.0):
+        """
+        Inputs:
+        path (str): a JSON file saved by CommandRecorder
+        time_scale (float): the factor of the recorded durations
+        """
+        with open(path, 'r', encoding='utf-8') as file:
+            fixture = json.load(file)
+        if fixture.get('format') != FORMAT or fixture.get('version') != VERSION:
+            raise ValueError(f"{path} is not a replay of version {VERSION}")
+        self.__commands = fixture['commands']
+        self.__time_scale = time_scale
+        self.__position = 0
+        self.__lock = threading.Lock()
+        self.w3c = True
+
+    def execute(self, command, params):
+        """Returns the recorded response of the next command"""
+        with self.__lock:
+            if self.__position >= len(self.__commands):
+                raise ValueError(f"Replay has no more commands, but {command} was sent")
+            record = self.__commands[self.__position]
+            if record['command'] != command or (command != NEW_SESSION and record['params'] != _snapshot(params)):
+                raise ValueError(f"Replay expected {record['command']} {record['params']} at command "
+                                 f"{self.__position}, but {command} {params} was sent")
+            self.__position += 1
+        if self.__time_scale > 0:
+            time.sleep(record['duration'] * self.__time_scale)
+        return copy.deepcopy(record['response'])
+
+    def remaining(self):
+        """Returns the number of recorded commands, which weren't replayed yet"""
+        with self.__lock:
+            return len(self.__commands) - self.__position
@@ -0,0 +1,160 @@
+"""An in-memory index, which finds the rows of a table by the beginning of a word or by a part of a definition"""
+
+from array import array
+from bisect import bisect_left
+
+# Sorts after every character, which a word can start with, so the words with a prefix are before prefix + _LAST
+_LAST = '\U0010ffff'
+
+
+def _trigrams(text):
+    """Returns a set with every 3 character long substring of text"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _fold(text):
+    """Returns the case folded text. The text itself, if it has no upper case, so it isn't stored twice"""
+    folded = text.casefold()
+    return text if folded == text else folded
+
+
+class WordIndex:
+    """
+    Indexes the (word, definition) rows under their keys. The words are kept in a sorted list, where the words with a
+    prefix are found with a binary search. The definitions have an array of row numbers per trigram. An array is made
+    the first time a query has its trigram and kept up to date after that, so typing a query scans the definitions
+    once, and the next characters only check the rows of the array
+
+    A row matches a query, if its word starts with the query or its definition contains the query. The definitions are
+    searched only for queries of 3 characters and more. The search is case-insensitive.
+    """
+    # The number of trigram arrays, after which they are dropped and made again for the next queries
+    MAX_TRIGRAMS = 1024
+    # The number of removed rows, after which the index is renumbered, if they are more than a half of the numbers
+    MIN_REBUILD = 1000
+
+    def __init__(self, rows=()):
+        """rows (iterable): the (key, word, definition) tuples to index"""
+        # Every added row gets a number. The lists are indexed by the numbers, and a removed row leaves None in them
+        self.__numbers = {}
+        self.__keys = []
+        self.__words = []
+        self.__definitions = []
+        # The case folded words in order and the numbers of their rows
+        self.__sorted_words = []
+        self.__sorted_numbers = array('L')
+        # {trigram: array with the numbers of the rows, which have it}. Numbers of removed rows are skipped by searches
+        self.__trigrams = {}
+        self.__removed = 0
+        self.extend(rows)
+
+    def add(self, key, word, definition):
+        """Indexes a row. A row, which is already indexed under the key, is replaced"""
+        if key in self.__numbers:
+            self.remove(key)
+        n = self._add_row(key, word, definition)
+        i = bisect_left(self.__sorted_words, self.__words[n])
+        self.__sorted_words.insert(i, self.__words[n])
+        self.__sorted_numbers.insert(i, n)
+
+    def extend(self, rows):
+        """Indexes the (key, word, definition) rows. The words are sorted once for all of them"""
+        first = len(self.__keys)
+        for key, word, definition in rows:
+            if key in self.__numbers:
+                self.remove(key)
+            self._add_row(key, word, definition)
+        if len(self.__keys) > first:
+            numbers = [n for n in range(len(self.__keys)) if self.__words[n] is not None]
+            numbers.sort(key=self.__words.__getitem__)
+            self.__sorted_words = [self.__words[n] for n in numbers]
+            self.__sorted_numbers = array('L', numbers)
+
+    def remove(self, key):
+        """Removes a row from the index. Raises KeyError, if there is no row with the key"""
+        n = self.__numbers.pop(key)
+        word = self.__words[n]
+        i = bisect_left(self.__sorted_words, word)
+        while self.__sorted_numbers[i] != n:
+            i += 1
+        del self.__sorted_words[i]
+        del self.__sorted_numbers[i]
+        # The number stays in the trigram arrays until they are rebuilt. The searches skip it
+        self.__keys[n] = self.__words[n] = self.__definitions[n] = None
+        self.__removed += 1
+        if self.__removed > self.MIN_REBUILD and self.__removed * 2 > len(self.__keys):
+            self._rebuild()
+
+    def search(self, query):
+        """Returns a set with the keys of the rows, which match the query. Every key matches an empty query"""
+        query = query.strip().casefold()
+        if not query:
+            return set(self.__numbers)
+
+        lo = bisect_left(self.__sorted_words, query)
+        hi = bisect_left(self.__sorted_words, query + _LAST, lo)
+        keys = self.__keys
+        result = {keys[n] for n in self.__sorted_numbers[lo:hi]}
+
+        if len(query) >= 3:
+            # The rows of an array only have one trigram of the query, so they are checked for the whole query. The
+            # shortest known array is used, and an array is made only, if the query has none
+            trigrams = _trigrams(query)
+            known = [self.__trigrams[t] for t in trigrams if t in self.__trigrams]
+            numbers = min(known, key=len) if known else self._make_trigram(query[:3])
+            definitions = self.__definitions
+            result.update(keys[n] for n in numbers if definitions[n] is not None and query in definitions[n])
+        return result
+
+    def matches(self, key, query):
+        """Returns True, if the row with the key matches the query"""
+        n = self.__numbers[key]
+        return WordIndex.row_matches(self.__words[n], self.__definitions[n], query)
+
+    @staticmethod
+    def row_matches(word, definition, query):
+        """Returns True, if a row with the word and the definition matches the query"""
+        query = query.strip().casefold()
+        return word.casefold().startswith(query) or (len(query) >= 3 and query in definition.casefold())
+
+    def clear(self):
+        """Removes every row from the index"""
+        self.__numbers.clear()
+        self.__keys.clear()
+        self.__words.clear()
+        self.__definitions.clear()
+        self.__sorted_words.clear()
+        self.__sorted_numbers = array('L')
+        self.__trigrams.clear()
+        self.__removed = 0
+
+    def __len__(self):
+        """Returns the number of indexed rows"""
+        return len(self.__numbers)
+
+    def _add_row(self, key, word, definition):
+        """Adds a row to the lists and the trigram arrays and returns its number. The sorted words aren't updated"""
+        n = len(self.__keys)
+        word, definition = _fold(word), _fold(definition)
+        self.__numbers[key] = n
+        self.__keys.append(key)
+        self.__words.append(word)
+        self.__definitions.append(definition)
+        for trigram, numbers in self.__trigrams.items():
+            if trigram in definition:
+                numbers.append(n)
+        return n
+
+    def _make_trigram(self, trigram):
+        """Returns the array with the numbers of the rows, which have the trigram in their definitions"""
+        if len(self.__trigrams) >= self.MAX_TRIGRAMS:
+            self.__trigrams.clear()
+        numbers = self.__trigrams[trigram] = array('L', (n for n, d in enumerate(self.__definitions)
+                                                         if d is not None and trigram in d))
+        return numbers
+
+    def _rebuild(self):
+        """Renumbers the rows, so the lists and the trigram arrays don't keep the removed ones"""
+        rows = [(self.__keys[n], self.__words[n], self.__definitions[n]) for n in self.__numbers.values()]
+        self.clear()
+        self.extend(rows)
@@ -0,0 +1,121 @@
+"""A pool of warm, logged-in webdriver sessions"""
+
+import queue
+import threading
+
+from .driver import WebDriver
+
+
+class SessionPool:
+    """
+    Keeps a number of logged-in WebDriver sessions, so a job doesn't pay for the browser startup and the log in
+
+    A session is health-checked every time it is acquired and replaced, if the browser doesn't respond. It is also
+    recycled (quit and replaced with a fresh one) after max_operations operations or when its browser uses more than
+    max_memory bytes.
+    """
+
+    def __init__(self, size, username, password, max_operations=500, max_memory=None, session_factory=WebDriver):
+        """
+        Inputs:
+        size (int): the number of sessions
+        username, password (str): the userdata, which every session logs in with
+        max_operations (int): the number of operations, after which a session is recycled
+        max_memory (int): the browser memory in bytes, after which a session is recycled. Isn't checked if None
+        session_factory (callable): creates a new session. WebDriver by default
+        """
+        assert size > 0, "Pool should have at least one session"
+        self.__size = size
+        self.__username = username
+        self.__password = password
+        self.__max_operations = max_operations
+        self.__max_memory = max_memory
+        self.__session_factory = session_factory
+
+        self.__idle = queue.Queue()
+        self.__operations = {}
+        self.__lock = threading.Lock()
+        self.__recycled = 0
+        self.__closed = False
+
+    def start(self):
+        """Starts and logs in all sessions"""
+        for _ in range(self.__size):
+            self.__idle.put(self._new_session())
+
+    def acquire(self, timeout=None):
+        """
+        Returns an idle session, which responds to the commands. Waits for one, if every session is busy. Raises
+        queue.Empty, if no session was released within timeout seconds
+
+        If a dead session can't be replaced, the error of the new session is raised. The dead session stays in the
+        pool, so the pool doesn't shrink, and its replacement is retried by the next acquire
+        """
+        session = self.__idle.get(timeout=timeout)
+        if not session.is_alive():
+            try:
+                session = self._replace(session)
+            except Exception:
+                self.__idle.put(session)
+                raise
+        return session
+
+    def release(self, session, operations=1):
+        """Returns a session to the pool after it performed the given number of operations"""
+        with self.__lock:
+            self.__operations[session] += operations
+            n = self.__operations[session]
+        if self.__closed:
+            self._quit(session)
+            return
+
+        memory = session.memory_usage() if self.__max_memory is not None else None
+        if n >= self.__max_operations or (memory is not None and memory > self.__max_memory):
+            try:
+                session = self._replace(session)
+            except Exception:
+                # The old session keeps working until a new one can be started. Its counter stays over the limit, so
+                # the replacement is retried on the next release
+                pass
+        self.__idle.put(session)
+
+    def stats(self):
+        """Returns a dictionary with the number of sessions, idle sessions and recycled sessions"""
+        return {'sessions': self.__size, 'idle': self.__idle.qsize(), 'recycled': self.__recycled}
+
+    def close(self):
+        """Quits all idle sessions. Busy sessions are quit when they are released"""
+        self.__closed = True
+        while True:
+            try:
+                self._quit(self.__idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def _new_session(self):
+        """Starts a session and logs it in. Raises ValueError, if the userdata isn't valid"""
+        session = self.__session_factory()
+        if not session.log_in(self.__username, self.__password):
+            session.quit()
+            raise ValueError("Provided userdata is not valid")
+        with self.__lock:
+            self.__operations[session] = 0
+        return session
+
+    def _replace(self, session):
+        """Returns a fresh session instead of the given one. The old session is quit only after the new one started"""
+        new_session = self._new_session()
+        self._quit(session)
+        with self.__lock:
+            self.__recycled += 1
+        return new_session
+
+    def _quit(self, session):
+        """Quits a session. A session with a dead browser is forgotten as well"""
+        with self.__lock:
+            self.__operations.pop(session, None)
+        try:
+            session.quit()
+        except Exception:
+            # A dead browser can fail to quit with connection errors of any kind
+            pass
@@ -0,0 +1,61 @@
+"""The timeouts and the other performance settings of the WebDriver, which are stored between the runs"""
+
+import json
+
+
+class Settings:
+    """
+    Stores the performance settings and loads them from a file, if present. The file is written by the tuner
+    (python -m quizlet_writer.tune), so every machine runs with the settings, which were measured fastest on it
+
+    wait_timeout: the seconds to wait for a page element to become clickable or visible
+    log_in_timeout: the seconds to wait for the outcome of a log in
+    add_card_timeout: the seconds to wait for the add card button
+    notification_timeout: the seconds to wait for the draft notification on the new set page
+    suggestion_timeout: the seconds to wait for the auto-suggested definitions of a word
+    poll_frequency: the seconds between the checks of a wait
+    headless: runs Chrome without a window
+    sessions: the number of browser sessions, which work at the same time
+    pipeline: the number of term rows, which look words up at once
+    """
+    FILE_NAME = "settings.json"
+    DEFAULTS = {'wait_timeout': 10, 'log_in_timeout': 3, 'add_card_timeout': 5, 'notification_timeout': 2,
+                'suggestion_timeout': 4, 'poll_frequency': 0.5, 'headless': False, 'sessions': 2, 'pipeline': 1}
+
+    def __init__(self, **values):
+        """Creates the default settings with the given values instead. Raises ValueError for an unknown setting"""
+        unknown = set(values) - set(Settings.DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown settings: {', '.join(sorted(unknown))}")
+        for name, default in Settings.DEFAULTS.items():
+            setattr(self, name, values.get(name, default))
+
+    def load_file(self, path=None):
+        """Loads the settings from the file. Does nothing if the file doesn't exist, and skips unknown settings"""
+        try:
+            with open(path or Settings.FILE_NAME, "r", encoding="utf-8") as file:
+                values = json.load(file)
+        except FileNotFoundError:
+            return
+        for name in Settings.DEFAULTS:
+            if name in values:
+                setattr(self, name, values[name])
+
+    def save_file(self, path=None):
+        """Rewrites the settings into the file"""
+        with open(path or Settings.FILE_NAME, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, indent=4)
+
+    def to_dict(self):
+        """Returns a dictionary {setting: value}"""
+        return {name: getattr(self, name) for name in Settings.DEFAULTS}
+
+    def copy(self, **changes):
+        """Returns a copy of the settings with the given values changed"""
+        return Settings(**dict(self.to_dict(), **changes))
+
+    def __eq__(self, other):
+        return isinstance(other, Settings) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"Settings({', '.join(f'{k}={v!r}' for k, v in self.to_dict().items())})"
@@ -0,0 +1,76 @@
+"""Splitting a big word list into several sets, which are uploaded at the same time"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from .compact import CompactPairs
+from .driver import WebDriver
+
+
+def shard_rows(rows, max_size):
+    """
+    Splits the rows into the fewest lists of at most max_size rows. The sizes of the lists differ by one at most, so
+    1001 rows with max_size 500 become 334, 334 and 333 rows instead of 500, 500 and 1. The shards of CompactPairs
+    are CompactPairs, which share its buffers
+    """
+    assert max_size > 0, "Set should have at least one card"
+    if not isinstance(rows, CompactPairs):
+        rows = list(rows)
+    n = max(-(-len(rows) // max_size), 1)
+    size, extra = divmod(len(rows), n)
+    shards = []
+    start = 0
+    for i in range(n):
+        end = start + size + (1 if i < extra else 0)
+        shards.append(rows[start:end])
+        start = end
+    return shards
+
+
+def shard_names(quiz_name, n):
+    """Returns the names of n sets: "Name (1/n)", "Name (2/n)", ... The name is kept as is, if there is one set"""
+    if n == 1:
+        return [quiz_name]
+    return [f"{quiz_name} ({i}/{n})" for i in range(1, n + 1)]
+
+
+def upload_shards(pool, quiz_name, quiz_description, words_and_definitions, max_size, synced_sets=None):
+    """
+    Uploads the rows as numbered sets of at most max_size cards. Every set is uploaded in its own session of the pool,
+    so the sets are uploaded concurrently. Returns a report with a dictionary per set in their order:
+    {'name': ..., 'cards': ..., 'set_id': ..., 'url': ..., 'error': ...}. The set_id and url of a failed set are None
+
+    Inputs:
+    pool (SessionPool): a started pool of logged-in sessions
+    quiz_name, quiz_description (str): the prefix of the set names and the description of every set
+    words_and_definitions (list or CompactPairs): the (word, definition) rows
+    max_size (int): the maximum number of cards in a set
+    synced_sets (SyncedSets): the sets, which were already uploaded under the same names, are synced instead of being
+        uploaded again, and the new ones are remembered. Isn't used if None
+    """
+    shards = shard_rows(words_and_definitions, max_size)
+    names = shard_names(quiz_name, len(shards))
+    synced = [synced_sets.get_set(name) if synced_sets is not None else None for name in names]
+
+    def upload(i):
+        session = pool.acquire()
+        try:
+            if synced[i] is None:
+                return session.upload_quiz(names[i], quiz_description, shards[i], import_mode=True)
+            set_id, old_rows = synced[i]
+            return session.sync_quiz(set_id, names[i], quiz_description, old_rows, shards[i])
+        finally:
+            pool.release(session)
+
+    report = []
+    with ThreadPoolExecutor(max_workers=min(pool.stats()['sessions'], len(shards))) as executor:
+        futures = [executor.submit(upload, i) for i in range(len(shards))]
+        for name, shard, future in zip(names, shards, futures):
+            try:
+                set_id, error = future.result(), None
+            except Exception as e:
+                set_id, error = None, repr(e)
+            if set_id is not None and synced_sets is not None:
+                synced_sets.set_set(name, set_id, shard)
+            report.append({'name': name, 'cards': len(shard), 'set_id': set_id,
+                           'url': WebDriver.SET_PAGE.format(set_id) if set_id is not None else None, 'error': error})
+    return report
@@ -0,0 +1,83 @@
+"""Coalescing of the concurrent lookups of the same word"""
+
+import threading
+
+
+class _Flight:
+    """A running lookup of a word. Its event is set, when the lookup ends"""
+    __slots__ = ('key', 'event', 'result', 'resolved')
+
+    def __init__(self, key):
+        self.key = key
+        self.event = threading.Event()
+        self.result = None
+        self.resolved = False
+
+
+class SingleFlight:
+    """
+    Keeps track of the words, which are being looked up, so a lookup of a word, which another lookup is already busy
+    with, waits for that one and gets its result instead of typing the word into the browser again
+
+    Words are the same, if they are equal after stripping the whitespace and case folding. The first lookup of a word
+    leads the flight: it has to either resolve the flight with its result or abandon it, so the followers look the
+    word up themselves
+    """
+
+    def __init__(self):
+        self.__flights = {}
+        self.__lock = threading.Lock()
+        self.coalesced = 0
+
+    @staticmethod
+    def normalize(word):
+        """Returns the key, which the flights of a word are found by"""
+        return word.strip().casefold()
+
+    def join(self, word):
+        """
+        Returns a tuple (flight, leader). leader is True, if there was no flight of the word, so the caller has to look
+        the word up. Otherwise the caller follows the flight of another lookup
+        """
+        key = SingleFlight.normalize(word)
+        with self.__lock:
+            flight = self.__flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                return flight, False
+            flight = self.__flights[key] = _Flight(key)
+            return flight, True
+
+    def resolve(self, flight, result):
+        """Ends a flight with the result of its lookup and wakes its followers"""
+        self._land(flight, result, True)
+
+    def abandon(self, flight):
+        """Ends a flight without a result, so its followers look the word up themselves. Does nothing if it ended"""
+        self._land(flight, None, False)
+
+    def wait(self, flight, timeout=None):
+        """
+        Returns the result of a flight, when it's resolved. Raises LookupError, if the flight was abandoned, and
+        TimeoutError, if it didn't end within timeout seconds
+        """
+        if not flight.event.wait(timeout):
+            raise TimeoutError(f"Lookup of {flight.key} is still running")
+        if not flight.resolved:
+            raise LookupError(f"Lookup of {flight.key} was abandoned")
+        return flight.result
+
+    def __len__(self):
+        """Returns the number of words, which are being looked up"""
+        with self.__lock:
+            return len(self.__flights)
+
+    def _land(self, flight, result, resolved):
+        """Removes a running flight, stores its outcome and wakes its followers"""
+        with self.__lock:
+            if self.__flights.get(flight.key) is not flight:
+                return
+            del self.__flights[flight.key]
+            flight.result = result
+            flight.resolved = resolved
+        flight.event.set()
@@ -0,0 +1,95 @@
+"""Files, which the definitions are streamed into while a lookup is running"""
+
+import csv
+import json
+import os
+import time
+
+
+class DefinitionSink:
+    """
+    Appends the results of WebDriver.iter_definitions to a JSONL or CSV file, so the results found so far stay on
+    disk, if a long lookup dies. The format is chosen by the extension of the file (.jsonl or .csv).
+
+    The file is flushed every flush_every records and when flush_interval seconds passed since the last flush. A JSONL
+    record is {"word": ..., "definition": ..., "candidates": [...]}, a CSV row is "word,definition" with an empty
+    definition for None.
+    """
+
+    FORMATS = ('.jsonl', '.csv')
+
+    def __init__(self, path, flush_every=100, flush_interval=5.0):
+        """
+        Inputs:
+        path (str): the file to append to. Is created, if it doesn't exist
+        flush_every (int): the number of records, after which the file is flushed
+        flush_interval (float): the seconds, after which the file is flushed
+        """
+        self.__format = os.path.splitext(path)[1].lower()
+        if self.__format not in self.FORMATS:
+            raise ValueError(f"Sink file should be one of {', '.join(self.FORMATS)}, not {path}")
+        self.__flush_every = flush_every
+        self.__flush_interval = flush_interval
+        self.__file = open(path, 'a', newline='', encoding='utf-8')
+        self.__writer = csv.writer(self.__file) if self.__format == '.csv' else None
+        self.__pending = 0
+        self.__last_flush = time.monotonic()
+        self.written = 0
+
+    def write(self, word, definition, candidates=()):
+        """Appends a record and flushes the file, if it's time to"""
+        if self.__writer is not None:
+            self.__writer.writerow([word, definition if definition is not None else ''])
+        else:
+            record = {'word': word, 'definition': definition, 'candidates': list(candidates)}
+            self.__file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.written += 1
+        self.__pending += 1
+        if self.__pending >= self.__flush_every or time.monotonic() - self.__last_flush >= self.__flush_interval:
+            self.flush()
+
+    def write_all(self, results):
+        """Appends every (word, definition, candidates) tuple of an iterable as soon as it is produced"""
+        for result in results:
+            self.write(*result)
+
+    def flush(self):
+        """Writes the buffered records to disk"""
+        self.__file.flush()
+        self.__pending = 0
+        self.__last_flush = time.monotonic()
+
+    def close(self):
+        """Flushes and closes the file"""
+        if not self.__file.closed:
+            self.flush()
+            self.__file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def read_definitions(path):
+    """
+    Returns a dictionary {word: definition} with the records, which a DefinitionSink wrote to a file, so an interrupted
+    lookup can skip the words it already found. A truncated last line is ignored
+    """
+    definitions = {}
+    if not os.path.exists(path):
+        return definitions
+    with open(path, 'r', newline='', encoding='utf-8') as file:
+        if os.path.splitext(path)[1].lower() == '.csv':
+            for row in csv.reader(file):
+                if len(row) == 2:
+                    definitions[row[0]] = row[1] if row[1] else None
+        else:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                definitions[record['word']] = record['definition']
+    return definitions
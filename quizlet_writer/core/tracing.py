@@ -0,0 +1,89 @@
+"""Tracing of the commands, which a webdriver sends to the browser"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+class CommandTracer:
+    """
+    Records every command, which a webdriver sends to the browser, with its duration and the high-level operation
+    (log_in, a word of get_definitions, a card of upload_quiz, ...), which issued it
+
+    The timeline is saved in the Trace Event Format, so it can be opened in chrome://tracing or ui.perfetto.dev
+    """
+
+    def __init__(self):
+        self.__events = []
+        self.__round_trips = {}
+        self.__lock = threading.Lock()
+        self.__local = threading.local()
+        self.__start = time.perf_counter()
+
+    def attach(self, driver):
+        """Starts tracing the commands of a selenium driver by wrapping its command executor"""
+        executor = driver.command_executor
+        execute = executor.execute
+
+        def traced_execute(command, params):
+            t0 = time.perf_counter()
+            try:
+                return execute(command, params)
+            finally:
+                self._record(command, t0, time.perf_counter())
+
+        executor.execute = traced_execute
+
+    @contextmanager
+    def operation(self, name, **args):
+        """
+        A context, which attributes every command sent inside it to the operation with the given name. It gives the
+        arguments of the operation, so the results of the operation can be added to them
+        """
+        stack = self._get_stack()
+        stack.append([name, 0])
+        t0 = time.perf_counter()
+        try:
+            yield args
+        finally:
+            t1 = time.perf_counter()
+            _, n = stack.pop()
+            self._add_event(name, 'operation', t0, t1, dict(args, round_trips=n))
+
+    def round_trips(self):
+        """Returns a dictionary {operation: {command: number of calls}}. Untraced commands are under None"""
+        with self.__lock:
+            return {op: dict(commands) for op, commands in self.__round_trips.items()}
+
+    def save(self, path):
+        """Writes the timeline into a JSON file"""
+        with self.__lock:
+            trace = {'traceEvents': list(self.__events), 'displayTimeUnit': 'ms'}
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(trace, file)
+
+    def _get_stack(self):
+        """Returns the stack of the operations, which are running on the current thread"""
+        if not hasattr(self.__local, 'stack'):
+            self.__local.stack = []
+        return self.__local.stack
+
+    def _record(self, command, t0, t1):
+        """Counts a command in every running operation and adds it to the timeline"""
+        stack = self._get_stack()
+        for frame in stack:
+            frame[1] += 1
+        operation = stack[-1][0] if stack else None
+        with self.__lock:
+            commands = self.__round_trips.setdefault(operation, {})
+            commands[command] = commands.get(command, 0) + 1
+        self._add_event(command, 'webdriver', t0, t1, {'operation': operation})
+
+    def _add_event(self, name, category, t0, t1, args):
+        """Adds a complete event (with microsecond timestamps) to the timeline"""
+        event = {'name': name, 'cat': category, 'ph': 'X', 'pid': os.getpid(), 'tid': threading.get_ident(),
+                 'ts': (t0 - self.__start) * 1e6, 'dur': (t1 - t0) * 1e6, 'args': args}
+        with self.__lock:
+            self.__events.append(event)
@@ -0,0 +1,74 @@
+"""User data and the state of the uploaded sets, which are stored between the runs"""
+
+import json
+
+
+class UserData:
+    """Stores user data and loads it from a file, if present"""
+
+    def __init__(self):
+        self.__username = ''
+        self.__password = ''
+
+    def set_userdata(self, new_name, new_pass):
+        """Sets new username and password"""
+        self.__username = new_name
+        self.__password = new_pass
+
+    def get_userdata(self):
+        """Returns username and password in a tuple"""
+        return self.__username, self.__password
+
+    def save_file(self):
+        """Rewrites the userdata into a file"""
+        with open("user_data.txt", "w") as file:
+            print(f"{self.__username}\n"
+                  f"{self.__password}", file=file)
+
+    def clear_file(self):
+        """Clears the file"""
+        with open("user_data.txt", "w"):
+            pass
+
+    def update_userdata(self):
+        """Sets username and password from the file. Raises ValueError exception, if the file is not
+        formatted correctly"""
+        with open("user_data.txt", "r") as file:
+            file_lines = [l.strip() for l in file]
+            if len(file_lines) == 2:
+                self.__username, self.__password = file_lines
+            else:
+                raise ValueError("File is not formatted correctly")
+
+
+class SyncedSets:
+    """Remembers, which set every quiz was uploaded to and what the set contained after the last upload"""
+    FILE_NAME = "synced_sets.json"
+
+    def __init__(self):
+        self.__sets = {}
+
+    def load_file(self):
+        """Loads the synced sets from the file. Does nothing if the file doesn't exist"""
+        try:
+            with open(SyncedSets.FILE_NAME, "r", encoding="utf-8") as file:
+                self.__sets = json.load(file)
+        except FileNotFoundError:
+            self.__sets = {}
+
+    def save_file(self):
+        """Rewrites the synced sets into the file"""
+        with open(SyncedSets.FILE_NAME, "w", encoding="utf-8") as file:
+            json.dump(self.__sets, file, ensure_ascii=False)
+
+    def get_set(self, quiz_name):
+        """Returns a tuple with the set id and the last synced words and definitions, or None if the quiz wasn't
+        uploaded yet"""
+        synced_set = self.__sets.get(quiz_name)
+        if synced_set is None:
+            return None
+        return synced_set['id'], [tuple(r) for r in synced_set['rows']]
+
+    def set_set(self, quiz_name, set_id, words_and_definitions):
+        """Remembers the set id and the content of an uploaded quiz"""
+        self.__sets[quiz_name] = {'id': set_id, 'rows': [list(r) for r in words_and_definitions]}
@@ -0,0 +1,68 @@
+"""Processing of words and definitions, which doesn't need a browser"""
+
+import re
+from difflib import SequenceMatcher
+
+
+def diff_rows(old_rows, new_rows):
+    """
+    Computes the edits, which turn a set with old_rows into a set with new_rows
+
+    The edits are applied in the order they are returned: the removed rows are deleted (from the last one), then the
+    inserted rows are inserted (from the first one) and at last the changed rows are rewritten. Only the rows, which
+    differ between the sets, are touched.
+
+    Inputs:
+    old_rows (List[Tuple[str, str]]): words and definitions of the uploaded set
+    new_rows (List[Tuple[str, str]]): words and definitions, which the set should have
+
+    Output: a tuple with the following indices
+    0 - removed: indices of the old rows to delete, in descending order
+    1 - inserted: a list of tuples (index, word, definition) in ascending order, where index is a position in new_rows
+    2 - changed: a list of tuples (index, word, definition), where index is a position in new_rows
+    """
+    old_rows = [tuple(r) for r in old_rows]
+    new_rows = [tuple(r) for r in new_rows]
+    removed, inserted, changed = [], [], []
+    matcher = SequenceMatcher(None, old_rows, new_rows, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            continue
+        # The replaced rows are rewritten in place. The rest of a longer old block is removed, and the rest of a longer
+        # new block is inserted
+        n_changed = min(i2 - i1, j2 - j1) if tag == 'replace' else 0
+        changed.extend((j, *new_rows[j]) for j in range(j1, j1 + n_changed))
+        removed.extend(range(i1 + n_changed, i2))
+        inserted.extend((j, *new_rows[j]) for j in range(j1 + n_changed, j2))
+    return sorted(removed, reverse=True), inserted, changed
+
+
+def del_duplicates(words):
+    """Deletes duplicate strings from words list, but saves the order"""
+    assert len(words) > 0, "List should have at least one item"
+    unique_words = set([words[0]])
+    i = 1
+    while i < len(words):
+        if words[i] in unique_words:
+            del (words[i])
+        else:
+            unique_words.add(words[i])
+            i += 1
+
+
+def to_import_text(words_and_definitions, term_separator='\t', row_separator='\n'):
+    """
+    Serializes words and definitions into the text, which is accepted by the import box of the Quizlet set form
+
+    The import format has no escape sequences, so every separator, tab or line break inside a word or a definition is
+    replaced with a single space.
+
+    Inputs:
+    words_and_definitions (iterable): an iterable with tuples containing a word and a definition
+    term_separator (str): a separator between a word and its definition
+    row_separator (str): a separator between the cards
+    """
+    special = [re.escape(c) for c in (term_separator, row_separator, '\t', '\r', '\n') if c]
+    special_re = re.compile('(?:' + '|'.join(special) + ')+')
+    return row_separator.join(special_re.sub(' ', str(word)) + term_separator + special_re.sub(' ', str(definition))
+                              for word, definition in words_and_definitions)
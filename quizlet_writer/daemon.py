@@ -0,0 +1,297 @@
+"""
+A local job service, which keeps logged-in browser sessions warm between the jobs
+
+Run it with `python -m quizlet_writer.daemon` and submit jobs to http://127.0.0.1:8765/jobs:
+
+    POST /jobs        {"client": "me", "words": ["Tree", "Water"], "quiz_name": "Nature", "description": ""}
+                      or {"word_file": "words.txt", "separator": ","} instead of "words". A quiz is uploaded only if
+                      quiz_name is given. With "output": "results.jsonl" (or .csv) the definitions are appended to
+                      the file as they are found instead of being kept in the job. Returns {"id": ...}
+    GET /jobs/<id>    the status of a job and, when it's done, its words, definitions and set id
+    GET /health       the state of the session pool, the queue and the definition cache
+
+A word, which two jobs look up at the same time, is typed into the browser only once: the later job waits for the
+result of the earlier one.
+
+With `--cache definitions.json.gz` the daemon starts with the definitions of a snapshot (see quizlet_writer.snapshots)
+and looks up only the other words. The snapshot is rewritten with the new definitions every `--save-interval`
+seconds and when the daemon stops, on Ctrl+C as well as on SIGTERM.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import signal
+import sys
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .core import CompactPairs, CompactStrings, DefinitionCache, DefinitionSink, SessionPool, Settings, SingleFlight, \
+    UserData, del_duplicates
+
+
+class FairJobQueue:
+    """
+    A queue of jobs, which takes the jobs of different clients in turn, so a client with a long queue of jobs doesn't
+    delay the others. The jobs of a single client are taken in the order they were put
+    """
+
+    def __init__(self):
+        self.__jobs = {}
+        self.__clients = deque()
+        self.__condition = threading.Condition()
+
+    def put(self, client, job):
+        """Appends a job to the queue of the client"""
+        with self.__condition:
+            if client not in self.__jobs:
+                self.__jobs[client] = deque()
+                self.__clients.append(client)
+            self.__jobs[client].append(job)
+            self.__condition.notify()
+
+    def get(self):
+        """Removes and returns the next job. Waits until there is one"""
+        with self.__condition:
+            while not self.__clients:
+                self.__condition.wait()
+            client = self.__clients.popleft()
+            jobs = self.__jobs[client]
+            job = jobs.popleft()
+            if jobs:
+                self.__clients.append(client)
+            else:
+                del self.__jobs[client]
+            return job
+
+    def __len__(self):
+        """Returns the number of queued jobs"""
+        with self.__condition:
+            return sum(len(jobs) for jobs in self.__jobs.values())
+
+
+class JobDaemon:
+    """Runs the "word file -> definitions -> upload" jobs on a pool of warm sessions"""
+
+    def __init__(self, pool, pipeline=1, cache=None):
+        """
+        Inputs:
+        pool (SessionPool): the sessions, which the jobs are run on. One worker is started per session
+        pipeline (int): the number of term rows, which every session looks words up in at once
+        cache (DefinitionCache): the definitions, which don't have to be looked up. Isn't used if None
+        """
+        self.__pool = pool
+        self.__pipeline = pipeline
+        self.__cache = cache
+        self.__flights = SingleFlight()
+        self.__queue = FairJobQueue()
+        self.__jobs = {}
+        self.__ids = itertools.count(1)
+        self.__lock = threading.Lock()
+        self.__workers = [threading.Thread(target=self._work, daemon=True) for _ in range(pool.stats()['sessions'])]
+
+    def start(self):
+        """Starts the sessions and the workers"""
+        self.__pool.start()
+        for worker in self.__workers:
+            worker.start()
+
+    def submit(self, request):
+        """
+        Queues a job and returns its id. Raises ValueError, if the request has neither words nor a word file
+
+        Inputs:
+        request (dict): a job request. See the module docstring for the keys
+        """
+        if 'words' in request:
+            words = [str(w).strip() for w in request['words']]
+        elif 'word_file' in request:
+            with open(request['word_file'], 'r') as file:
+                words = [w.strip() for w in file.read().split(request.get('separator', ','))]
+        else:
+            raise ValueError("Job should have either words or word_file")
+        words = [w for w in words if w]
+        if not words:
+            raise ValueError("Job should have at least one word")
+        output = request.get('output')
+        if output and os.path.splitext(output)[1].lower() not in DefinitionSink.FORMATS:
+            raise ValueError(f"Output should be one of {', '.join(DefinitionSink.FORMATS)}")
+
+        # The jobs are kept after they are done, so their words and results are stored compactly
+        job = {'id': next(self.__ids), 'status': 'queued', 'words': CompactStrings(words),
+               'quiz_name': request.get('quiz_name'), 'description': request.get('description', ''), 'output': output}
+        with self.__lock:
+            self.__jobs[job['id']] = job
+        self.__queue.put(request.get('client', ''), job)
+        return job['id']
+
+    def get_job(self, job_id):
+        """Returns a copy of the job with the given id, or None if there is no such job. The lists are decoded"""
+        with self.__lock:
+            job = self.__jobs.get(job_id)
+            if job is None:
+                return None
+            return {key: value.tolist() if isinstance(value, CompactStrings) else value for key, value in job.items()}
+
+    def health(self):
+        """Returns a dictionary with the state of the pool and the queue"""
+        health = dict(self.__pool.stats(), queued=len(self.__queue), coalesced=self.__flights.coalesced)
+        if self.__cache is not None:
+            health.update(cached=len(self.__cache), cache_hits=self.__cache.hits, cache_misses=self.__cache.misses)
+        return health
+
+    def close(self):
+        """Quits the sessions"""
+        self.__pool.close()
+
+    def _work(self):
+        """Takes the jobs from the queue and runs them one by one"""
+        while True:
+            job = self.__queue.get()
+            self._set_status(job, 'running')
+            try:
+                session = self.__pool.acquire()
+            except Exception as e:
+                self._set_status(job, 'failed', error=repr(e))
+                continue
+            operations = 0
+            try:
+                words = list(job['words'])
+                del_duplicates(words)
+                if job['output']:
+                    # The results are streamed to the file, and only the rows of a quiz are kept in memory
+                    rows = CompactPairs(intern=True)
+                    with DefinitionSink(job['output']) as sink:
+                        lookup = session.iter_definitions(words, self.__pipeline, self.__cache, self.__flights)
+                        for word, definition, candidates in lookup:
+                            sink.write(word, definition, candidates)
+                            if job['quiz_name']:
+                                rows.append((word, definition if definition is not None else 'Not found'))
+                    results = {'written': sink.written}
+                else:
+                    definitions = session.get_definitions(words, self.__pipeline, self.__cache, self.__flights)
+                    rows = CompactPairs(((w, d if d is not None else 'Not found') for w, d in zip(words, definitions)),
+                                        intern=True)
+                    results = {'words': CompactStrings(words), 'definitions': definitions}
+                operations += 1
+                set_id = None
+                if job['quiz_name']:
+                    set_id = session.upload_quiz(job['quiz_name'], job['description'], rows, import_mode=True)
+                    operations += 1
+                self._set_status(job, 'done', set_id=set_id, **results)
+            except Exception as e:
+                self._set_status(job, 'failed', error=repr(e))
+            finally:
+                try:
+                    self.__pool.release(session, max(operations, 1))
+                except Exception:
+                    # The job has its status already, and the worker has to keep serving the queue
+                    pass
+
+    def _set_status(self, job, status, **results):
+        """Updates the status and the results of a job"""
+        with self.__lock:
+            job.update(results, status=status)
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    """Serves the HTTP API of the JobDaemon, which is stored in server.job_daemon"""
+
+    def do_POST(self):
+        if self.path != '/jobs':
+            self._send(404, {'error': 'Not found'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+            job_id = self.server.job_daemon.submit(request)
+        except (ValueError, OSError) as e:
+            self._send(400, {'error': str(e)})
+            return
+        self._send(202, {'id': job_id})
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send(200, self.server.job_daemon.health())
+        elif self.path.startswith('/jobs/'):
+            job_id = self.path[len('/jobs/'):]
+            job = self.server.job_daemon.get_job(int(job_id)) if job_id.isdigit() else None
+            if job is None:
+                self._send(404, {'error': 'Job not found'})
+            else:
+                self._send(200, job)
+        else:
+            self._send(404, {'error': 'Not found'})
+
+    def _send(self, code, body):
+        """Sends a JSON response"""
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def main():
+    # The defaults come from the settings file, which the tuner writes
+    settings = Settings()
+    settings.load_file()
+    parser = argparse.ArgumentParser(description="Runs Quizlet Writer jobs on warm browser sessions")
+    parser.add_argument('--port', type=int, default=8765, help="the localhost port to listen on")
+    parser.add_argument('--sessions', type=int, default=settings.sessions, help="the number of browser sessions")
+    parser.add_argument('--max-operations', type=int, default=500,
+                        help="the number of operations, after which a session is recycled")
+    parser.add_argument('--max-memory-mb', type=int, default=None,
+                        help="the browser memory, after which a session is recycled (needs psutil)")
+    parser.add_argument('--pipeline', type=int, default=settings.pipeline,
+                        help="the number of words, which every session looks up at once")
+    parser.add_argument('--cache', default=None,
+                        help="a definition snapshot, which seeds and keeps the found definitions")
+    parser.add_argument('--save-interval', type=float, default=300,
+                        help="the seconds between the saves of the definition snapshot, 0 saves it only on exit")
+    args = parser.parse_args()
+
+    user_data = UserData()
+    user_data.update_userdata()
+    max_memory = args.max_memory_mb * 2 ** 20 if args.max_memory_mb is not None else None
+    pool = SessionPool(args.sessions, *user_data.get_userdata(), max_operations=args.max_operations,
+                       max_memory=max_memory)
+
+    cache = None
+    if args.cache:
+        cache = DefinitionCache()
+        cache.load_file(args.cache)
+
+    daemon = JobDaemon(pool, args.pipeline, cache)
+    daemon.start()
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), JobRequestHandler)
+    server.job_daemon = daemon
+    stopped = threading.Event()
+    if cache is not None and args.save_interval > 0:
+        threading.Thread(target=_save_periodically, args=(cache, args.cache, args.save_interval, stopped),
+                         daemon=True).start()
+    # A service manager stops the daemon with SIGTERM, which would skip the finally block and lose the new definitions
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stopped.set()
+        server.server_close()
+        daemon.close()
+        if cache is not None:
+            cache.save_file(args.cache)
+
+
+def _save_periodically(cache, path, interval, stopped):
+    """Saves the cache into the snapshot every interval seconds until stopped is set"""
+    while not stopped.wait(interval):
+        cache.save_file(path)
+
+
+if __name__ == '__main__':
+    main()
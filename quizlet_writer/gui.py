@@ -10,20 +10,21 @@
 # FIXME: Redesign the interactions between UserData / UserDataForm / WebDriver objects (and Table & WebDriver in future)
 #   They should interact with each other in QuizLetApp class.
 
+import logging
 import os
+import queue
+import threading
 import tkinter as tk
 from string import ascii_lowercase as alphabet
 from string import digits
 from tkinter import filedialog, messagebox
 from tkinter import ttk
 
-from selenium import webdriver
-from selenium.common.exceptions import *
-from selenium.webdriver import ChromeOptions
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import NoSuchElementException
+
+from .core import CommandRecorder, CommandTracer, SessionPool, Settings, SyncedSets, UserData, WebDriver, WordIndex, \
+    read_rows, upload_shards, write_rows
+from .watchdog import StallWatchdog
 
 
 def center_window_in_parent(window, parent):
@@ -37,292 +38,6 @@ def center_window_in_parent(window, parent):
     window.geometry(f"{w}x{h}+{x}+{y}")  # widthxheight+x+y
 
 
-class elements_have_error(object):
-    """
-    An expectation that either of the label elements have an error
-
-    Returns the element and False if neither has an error
-    """
-
-    def __init__(self, locator):
-        """Locator (tuple) - used to find the elements. Example: (By.XPATH, "//form[@class=LoginForm]")"""
-        self.locator = locator
-
-    def __call__(self, driver):
-        elements = driver.find_elements(*self.locator)
-        for el in elements:
-            if el.get_attribute("aria-invalid") == 'true':
-                return el
-        return False
-
-
-class element_has_new_text(object):
-    """
-    An expectation that the AutoSuggested element either has a new text or an empty string
-
-    Returns the element, if either condition is True and False otherwise.
-    """
-
-    def __init__(self, parent, locator, old_defs):
-        """
-        Inputs:
-        parent (WebElement): a parent element to AugoSuggested el.
-        locator (Tuple[By.x, str]): a locator tuple
-        old_defs (List): a list with old definitions
-        """
-        self.parent = parent
-        self.locator = locator
-        self.old_defs = old_defs
-
-    def __call__(self, driver):
-        """
-        Returns the element, if the element's text is either empty or has at least one new definition. False
-        otherwise.
-
-        Raises NoSuchElementException, if the AugoSuggest element is not found
-        """
-        element = self.parent.find_element(*self.locator)
-        new_defs = [t for t in element.text.split('\n')]
-        for d in new_defs:
-            if d not in self.old_defs:
-                return element
-        return len(new_defs) == 0
-
-
-class WebDriver:
-    """Interacts with the Quizlet"""
-    SUCCESSFUL_LOGIN_PAGE = 'https://quizlet.com/latest'
-    NEW_QUIZ_PAGE = 'https://quizlet.com/create-set'
-    WEBSITE_PAGE = 'https://quizlet.com/'
-
-    def __init__(self):
-        # Log in button isn't clickable in headless mode.
-        chrome_options = ChromeOptions()
-        chrome_options.set_capability('unhandledPromptBehavior', 'accept')
-        driver_path = os.path.join(os.path.curdir, "chromedriver.exe")
-        self.__driver = webdriver.Chrome(driver_path, options=chrome_options)
-        self.__window_handle = self.__driver.current_window_handle
-
-    def _restore_window(self):
-        """Properly deiconifies the webdriver"""
-        self.__driver.switch_to.window(self.__window_handle)
-        self.__driver.set_window_rect(0, 0)
-
-    def log_in(self, username, password) -> bool:
-        """Tries to log in with the given userdata and returns True if successful. False otherwise."""
-        try:
-            self._navigate_to_log_in_form()
-            username_entry, password_entry, log_in_btn = self._get_log_in_elements()
-            username_entry.send_keys(username)
-            password_entry.send_keys(password)
-            log_in_btn.click()
-            return self._is_successful()
-        except (NoSuchElementException, ElementClickInterceptedException, TimeoutException) as e:
-            pass
-
-    def upload_quiz(self, quiz_name: str, quiz_description: str, words_and_definitions):
-        """Uploads a quiz with a given name/description and terms to the website"""
-        # Navigate to a new set
-        self._navigate_to_new_set()
-
-        # Get quiz_name/descr text entries, insert given arguments
-        quiz_name_e, quiz_descr_e = self._get_quiz_entries()
-        quiz_name_e.send_keys(quiz_name)
-        quiz_descr_e.send_keys(quiz_description)
-
-        # Get all entries, clear them
-        term_entries = self._get_term_entries(len(words_and_definitions))
-
-        # Insert words into entries
-        for i in range(len(words_and_definitions)):
-            w_e, d_e = term_entries[i]
-            word, definition = words_and_definitions[i]
-            w_e.send_keys(word)
-            d_e.send_keys(definition)
-
-        """
-        1. If there is not enough entries, create rows and append them to the term entries 
-        """
-        print('Uploaded', quiz_name, quiz_description, *words_and_definitions)
-
-    def _navigate_to_log_in_form(self):
-        """Navigates the webdriver to the log in form"""
-        self.__driver.get(WebDriver.WEBSITE_PAGE)
-        self._restore_window()
-        wait = WebDriverWait(self.__driver, 10)
-        log_in_el = wait.until(
-            EC.element_to_be_clickable((By.XPATH, "//div[@class='SiteNavLoginSection']/button[@aria-label='Log in']")),
-            "Log in button is not clickable"
-        )
-        log_in_el.click()
-
-    def _navigate_to_new_set(self):
-        """Navigates the webdriver to the new set page"""
-        self.__driver.get(WebDriver.NEW_QUIZ_PAGE)
-        self._restore_window()
-        try:
-            self.__driver.implicitly_wait(2)
-            self.__driver.find_element_by_xpath("//div[@class='UINotification UINotification--default']"
-                                                "//button[@class='UILink']").click()
-            try:
-                self.__driver.implicitly_wait(2)
-                self.__driver.find_element_by_xpath("//button[@class='UILink UILink--revert']").click()
-            except NoSuchElementException:
-                pass
-        except NoSuchElementException:
-            pass
-
-    def _get_log_in_elements(self):
-        """
-        Returns the elements of the log-in form in a tuple with the following indices
-
-        0 - username_entry
-        1 - password_entry
-        2 - log_in_btn
-        """
-
-        login_form = self.__driver.find_element_by_xpath(r"//form[@class='LoginPromptModal-form']")
-        username_entry = login_form.find_element_by_xpath(r"//input[@id='username']")
-        password_entry = login_form.find_element_by_xpath(r"//input[@id='password']")
-
-        wait = WebDriverWait(self.__driver, 10)
-        log_in_btn = wait.until(EC.element_to_be_clickable(
-            (By.XPATH, r"//form[@class='LoginPromptModal-form']//button[@aria-label='Log in']")
-        ))
-        return username_entry, password_entry, log_in_btn
-
-    def _is_successful(self):
-        """Returns True, if login was successful. False otherwise"""
-        wait = WebDriverWait(self.__driver, 3)
-
-        try:
-            wait.until(elements_have_error(
-                (By.XPATH, r"//form[@class='LoginPromptModal-form']"
-                           r"//label[@class='AssemblyInput AssemblyInput--filled']"))
-            )
-            return False
-        except TimeoutException as e:
-            return self.__driver.current_url == WebDriver.SUCCESSFUL_LOGIN_PAGE
-
-    def _clear_text_entry(self, text_entry):
-        """Clears the text in an text entry element"""
-        while text_entry.text != '':
-            try:
-                text_entry.click()
-                text_entry.send_keys(Keys.CONTROL + "a")
-                text_entry.send_keys(Keys.DELETE)
-                self.__driver.implicitly_wait(1)
-            except ElementClickInterceptedException:
-                pass
-
-    def _get_quiz_entries(self):
-        """Returns a tuple with name and description entries after clearing them"""
-        elements_holder = self.__driver.find_element_by_xpath(r"//div[@class='CreateSetHeader-headingContent']")
-        name_e = elements_holder.find_element_by_xpath(
-            r"//textarea[@placeholder='Enter a title, like “Biology - Chapter 22: Evolution”']")
-        descr_e = elements_holder.find_element_by_xpath(r"//textarea[@placeholder='Add a description...']")
-        name_e.clear()
-        descr_e.clear()
-        return name_e, descr_e
-
-    def _get_term_entries(self, n):
-        """Returns a list of n tuples with term and definition entry"""
-        term_rows = self.__driver.find_elements_by_xpath(r"//div[@class='TermRows-termRowWrap']")
-        wait = WebDriverWait(self.__driver, 5, 0.5)
-
-        # Creating additional entries, if needed
-        while len(term_rows) < n:
-            try:
-                wait.until(EC.element_to_be_clickable((By.XPATH, r"//button[@aria-label='+ Add card']"))).click()
-                term_rows = self.__driver.find_elements_by_xpath(r"//div[@class='TermRows-termRowWrap']")
-            except ElementClickInterceptedException:
-                pass
-
-        # Adding tuples with entries to the list
-        term_entries = [t for t in zip(
-            term_rows[0].find_elements_by_xpath(r"//div[@aria-labelledby='editor-term-side']"),
-            term_rows[0].find_elements_by_xpath(r"//div[@aria-labelledby='editor-definition-side']")
-        )]
-
-        return term_entries
-
-    def _get_definition_elements(self):
-        """
-        Returns first row elements in a tuple
-
-        0 - term_row_wrap
-        1 - password_entry
-        2 - log_in_btn
-        """
-        term_row_wrap = self.__driver.find_element_by_xpath(
-            "//div[@class='TermRows']/div/div[@data-term-luid='term-0']")
-        word_entry = term_row_wrap.find_element_by_xpath("//div[@aria-labelledby='editor-term-side']")
-        definition_entry = term_row_wrap.find_element_by_xpath("//div[@aria-labelledby='editor-definition-side']")
-        return term_row_wrap, word_entry, definition_entry
-
-    def _del_duplicates(self, words):
-        """Deletes duplicate strings from words list"""
-        assert len(words) > 0, "List should have at least one item"
-        unique_words = set([words[0]])
-        i = 1
-        while i < len(words):
-            if words[i] in unique_words:
-                del (words[i])
-            else:
-                unique_words.add(words[i])
-                i += 1
-
-    def get_definitions(self, words):
-        """
-        Returns a list with definitions for each unique word in words list. Appends None if there is no definition.
-
-        Input: words (iterable): an iterable with words
-
-        Output: a list with definitions.
-        """
-        # Works, but the user must not interact with the browser (headless mode wouldn't allow this)
-        try:
-            definitions = []
-            auto_defs = []
-            words = list(words)
-
-            # Create a new quiz, find entries
-            self._navigate_to_new_set()
-            term_row, word_entry, definition_entry = self._get_definition_elements()
-            word_entry.clear()
-            definition_entry.clear()
-            wait = WebDriverWait(self.__driver, 4)
-
-            # Delete all duplicates from words, but saves the order
-            self._del_duplicates(words)
-
-            # For each word, find an auto-suggested definition.
-            for word in words:
-                try:
-                    word_entry.send_keys(word)
-                    definition_entry.click()
-                    auto_suggest_el = wait.until(
-                        element_has_new_text(
-                            term_row, (By.XPATH, "//div[@class='AutosuggestContext-suggestions']"), auto_defs
-                        )
-                    )
-                    # Choose the longest proposed definition and append it to the definitions list
-                    auto_defs = sorted([t for t in auto_suggest_el.text.split('\n')], key=len)
-                    definitions.append(auto_defs[-1] if len(auto_defs) > 0 else None)
-                    self._clear_text_entry(word_entry)
-                except (NoSuchElementException, TimeoutException):
-                    definitions.append(None)
-                    self._clear_text_entry(word_entry)
-            return definitions
-        except (ElementNotInteractableException, StaleElementReferenceException):
-            return self.get_definitions(words)
-        except NoSuchElementException:
-            messagebox.showerror("Error!", "Web elements could not be found. Retry to upload the words")
-
-    def quit(self):
-        self.__driver.quit()
-
-
 class UserDataForm:
     """Creates a form, which pops up when UserData needs to be updated"""
 
@@ -460,47 +175,17 @@ class UserDataForm:
         return self.__remember_me_bool.get()
 
 
-class UserData:
-    """Stores user data and loads it from a file, if present"""
-
-    def __init__(self):
-        self.__username = ''
-        self.__password = ''
-
-    def set_userdata(self, new_name, new_pass):
-        """Sets new username and password"""
-        self.__username = new_name
-        self.__password = new_pass
-
-    def get_userdata(self):
-        """Returns username and password in a tuple"""
-        return self.__username, self.__password
-
-    def save_file(self):
-        """Rewrites the userdata into a file"""
-        with open("user_data.txt", "w") as file:
-            print(f"{self.__username}\n"
-                  f"{self.__password}", file=file)
-
-    def clear_file(self):
-        """Clears the file"""
-        with open("user_data.txt", "w"):
-            pass
-
-    def update_userdata(self):
-        """Sets username and password from the file. Raises ValueError exception, if the file is not
-        formatted correctly"""
-        with open("user_data.txt", "r") as file:
-            file_lines = [l.strip() for l in file]
-            if len(file_lines) == 2:
-                self.__username, self.__password = file_lines
-            else:
-                raise ValueError("File is not formatted correctly")
-
-
 class Table:
     """A table, on which words and definitions will be printed"""
 
+    # The number of rows, which are read, written or inserted at once, while a file is imported or exported
+    CHUNK_SIZE = 1000
+    # The milliseconds between the checks of a running import or export
+    POLL_INTERVAL = 20
+
+    # The types of the files, which can be imported and exported
+    FILE_TYPES = [('CSV file', '*.csv'), ('TSV file', '*.tsv'), ('Anki file', '*.txt')]
+
     def __init__(self, parent):
         """
         Creates a frame with a treeview and buttons, which can be placed on a parent widget
@@ -514,8 +199,22 @@ class Table:
         # Main frame
         self.__main_frame = tk.LabelFrame(parent)
 
-        # Treeview instance
+        # Filter box. Every change of the text narrows the table to the rows, which match it
+        self.__filter_frame = tk.Frame(self.__main_frame)
+        self.__filter_lbl = tk.Label(self.__filter_frame, text='Filter:', justify=tk.LEFT)
+        self.__filter_text = tk.StringVar()
+        self.__filter_e = tk.Entry(self.__filter_frame, textvariable=self.__filter_text)
+        self.__filter_text.trace_add('write', lambda *args: self.apply_filter())
+
+        # Treeview instance. The rows are mirrored in a dictionary {iid: (word, definition)} in the order of the table,
+        # so the rows are read without a Tcl call per row. The index of the filter and the positions of the rows, which
+        # order its results, are made the first time the filter has a query
         self.__tree = ttk.Treeview(self.__main_frame)
+        self.__rows = {}
+        self.__index = None
+        self.__positions = None
+        self.__last_position = 0
+        self.__file_jobs = queue.Queue(maxsize=16)
         self.__tree.config(columns=('Word', 'Definition'))
 
         # Format columns
@@ -531,6 +230,8 @@ class Table:
         # Buttons
         self.__del_button = tk.Button(self.__main_frame, text='Delete (Del)', command=self.delete_row)
         self.__modify_button = tk.Button(self.__main_frame, text='Modify (M)', command=self.modify_row)
+        self.__import_button = tk.Button(self.__main_frame, text='Import...', command=self._ask_import)
+        self.__export_button = tk.Button(self.__main_frame, text='Export...', command=self._ask_export)
 
         # Binding events to keys
         self.__tree.bind("<Double-Button-1>", lambda e: self.__modify_button.invoke())
@@ -540,8 +241,13 @@ class Table:
         self.pack_widgets()
 
     def pack_widgets(self):
+        self.__filter_lbl.pack(side=tk.LEFT)
+        self.__filter_e.pack(side=tk.LEFT, expand=True, fill=tk.X)
+        self.__filter_frame.pack(side=tk.TOP, fill=tk.X)
         self.__tree.pack(side=tk.TOP)
         self.__del_button.pack(side=tk.LEFT, expand=True, fill=tk.X)
+        self.__import_button.pack(side=tk.LEFT, expand=True, fill=tk.X)
+        self.__export_button.pack(side=tk.LEFT, expand=True, fill=tk.X)
         self.__modify_button.pack(side=tk.RIGHT, expand=True, fill=tk.X)
 
     def grid_table(self, **kwargs):
@@ -549,14 +255,27 @@ class Table:
 
     def clear(self):
         """Deletes all items from the table"""
-        for c in self.__tree.get_children():
-            self.__tree.delete(c)
+        # The rows, which are hidden by the filter, are deleted as well
+        if self.__rows:
+            self.__tree.delete(*self.__rows)
+        self.__rows.clear()
+        self.__index = None
+        self.__positions = None
 
     def append(self, word, definition):
         """Appends a word with its definition to the table"""
         if definition is None:
             definition = 'Not found'
-        self.__tree.insert(parent='', index='end', values=(word, definition))
+        word, definition = str(word), str(definition)
+        iid = self.__tree.insert(parent='', index='end', values=(word, definition))
+        self.__rows[iid] = (word, definition)
+        if self.__index is not None:
+            self.__index.add(iid, word, definition)
+        if self.__positions is not None:
+            self.__last_position += 1
+            self.__positions[iid] = self.__last_position
+        if not WordIndex.row_matches(word, definition, self.__filter_text.get()):
+            self.__tree.detach(iid)
 
     def extend(self, words, definitions):
         """Appends all words and definitions to the table"""
@@ -566,7 +285,13 @@ class Table:
     def delete_row(self, event=None):
         """Deletes a focused row from the table"""
         item_iid = self.__tree.focus()
-        self.__tree.delete(item_iid)
+        if item_iid != '':
+            self.__tree.delete(item_iid)
+            del self.__rows[item_iid]
+            if self.__index is not None:
+                self.__index.remove(item_iid)
+            if self.__positions is not None:
+                del self.__positions[item_iid]
 
     def modify_row(self, event=None):
         """Modifies the data on the selected row"""
@@ -576,6 +301,11 @@ class Table:
             item_iid = self.__tree.focus()
             new_word, new_def = new_word_e.get(), new_def_e.get()
             self.__tree.item(item_iid, values=(new_word, new_def))
+            self.__rows[item_iid] = (new_word, new_def)
+            if self.__index is not None:
+                self.__index.add(item_iid, new_word, new_def)
+            if not WordIndex.row_matches(new_word, new_def, self.__filter_text.get()):
+                self.__tree.detach(item_iid)
             modify_window.destroy()
 
         def cancel():
@@ -596,7 +326,7 @@ class Table:
             new_word_lbl = tk.Label(modify_window, text='New word: ', justify=tk.LEFT)
             new_def_lbl = tk.Label(modify_window, text='New definition: ', justify=tk.LEFT)
             new_word_e = tk.Entry(modify_window, width=20)
-            old_word = self.__tree.item(self.__tree.focus()).get('values')[0]
+            old_word = self.__rows[self.__tree.focus()][0]
             new_word_e.insert(0, old_word)
             new_def_e = tk.Entry(modify_window, width=20)
             ok_button = tk.Button(modify_window, text='OK', command=ok)
@@ -622,11 +352,11 @@ class Table:
         Inputs:
             col (int): column numbers. Starts from 0
         """
-        word_def_list = [self.__tree.item(iid).get('values') for iid in self.__tree.get_children()]
-        word_def_list.sort(key=lambda x: x[col])
-        self.clear()
-        for row_data in word_def_list:
-            self.append(*row_data)
+        # The items are moved into the new order, so the index of the filter stays valid
+        order = sorted(self.__rows, key=lambda iid: self.__rows[iid][col])
+        self.__rows = {iid: self.__rows[iid] for iid in order}
+        self.__positions = None
+        self.apply_filter()
 
     def configure_column(self, cid, **kwargs):
         """
@@ -639,17 +369,123 @@ class Table:
                                                    f" {'-' + ' -'.join(self.__tree.cget('columns'))}"
         self.__tree.column(cid, **kwargs)
 
+    def apply_filter(self):
+        """
+        Shows only the rows, which match the text of the filter box, in the order of the table. Costs the search and
+        the sort of the matching rows, after the index was made by the first query
+        """
+        query = self.__filter_text.get()
+        if query.strip():
+            if self.__index is None:
+                self.__index = WordIndex((iid, w, d) for iid, (w, d) in self.__rows.items())
+            if self.__positions is None:
+                self.__positions = {iid: i for i, iid in enumerate(self.__rows)}
+                self.__last_position = len(self.__positions)
+            visible = sorted(self.__index.search(query), key=self.__positions.__getitem__)
+        else:
+            visible = self.__rows
+        self.__tree.set_children('', *visible)
+
+    def set_filter(self, text):
+        """Puts the text into the filter box, which filters the table"""
+        self.__filter_text.set(text)
+
+    def get_visible_words(self):
+        """Returns a list with the words of the rows, which the filter shows"""
+        return [self.__rows[iid][0] for iid in self.__tree.get_children()]
+
     def get_words_and_definitions(self):
-        """Returns a list with tuples containing a word and a definition"""
-        words_and_definitions = []
-        for iid in self.__tree.get_children():
-            w, d = self.__tree.item(iid)['values']
-            words_and_definitions.append((w, d))
-        return words_and_definitions
+        """
+        Returns a list of tuples containing a word and a definition. The rows hidden by the filter are included. The
+        list shares the row tuples of the table, so an upload or an export costs a reference per row instead of a
+        second copy of every word and definition
+        """
+        return list(self.__rows.values())
+
+    def import_file(self, path, on_done=None):
+        """
+        Appends the rows of a CSV, TSV or Anki file to the table. The file is read on another thread, and the rows are
+        inserted chunk by chunk between the events, so the window stays responsive
+
+        Inputs:
+            path (str): the file to import
+            on_done (callable): is called with the number of imported rows or with the exception, which stopped the
+                import. An error message is shown, if None
+        """
+        def read():
+            n = 0
+            try:
+                for chunk in read_rows(path, self.CHUNK_SIZE):
+                    self.__file_jobs.put(chunk)
+                    n += len(chunk)
+                self.__file_jobs.put(n)
+            except (OSError, ValueError, UnicodeError) as e:
+                self.__file_jobs.put(e)
+
+        self._run_file_job(read, on_done)
+
+    def export_file(self, path, on_done=None):
+        """
+        Writes the rows of the table into a CSV, TSV or Anki file on another thread
+
+        Inputs:
+            path (str): the file to export to
+            on_done (callable): is called with the number of exported rows or with the exception, which stopped the
+                export. An error message is shown, if None
+        """
+        rows = self.get_words_and_definitions()
+
+        def write():
+            try:
+                self.__file_jobs.put(write_rows(path, rows, self.CHUNK_SIZE))
+            except (OSError, ValueError) as e:
+                self.__file_jobs.put(e)
+
+        self._run_file_job(write, on_done)
+
+    def _run_file_job(self, target, on_done):
+        """Runs an import or export on another thread and polls its results from the event loop"""
+        def poll():
+            # A chunk of rows per poll, so the inserts don't block the events
+            try:
+                result = self.__file_jobs.get_nowait()
+            except queue.Empty:
+                self.__main_frame.after(self.POLL_INTERVAL, poll)
+                return
+            if isinstance(result, list):
+                for word, definition in result:
+                    self.append(word, definition)
+                self.__main_frame.after_idle(poll)
+                return
+
+            self.__import_button.config(state=tk.NORMAL)
+            self.__export_button.config(state=tk.NORMAL)
+            if on_done is not None:
+                on_done(result)
+            elif isinstance(result, Exception):
+                messagebox.showerror("Error!", f"The file could not be processed: {result}")
+
+        # One import or export at a time
+        self.__import_button.config(state=tk.DISABLED)
+        self.__export_button.config(state=tk.DISABLED)
+        threading.Thread(target=target, daemon=True).start()
+        self.__main_frame.after(self.POLL_INTERVAL, poll)
+
+    def _ask_import(self):
+        """Asks for a file and imports it"""
+        path = filedialog.askopenfilename(title='Import words', filetypes=self.FILE_TYPES)
+        if path:
+            self.import_file(path)
+
+    def _ask_export(self):
+        """Asks for a file and exports the table into it"""
+        path = filedialog.asksaveasfilename(title='Export words', filetypes=self.FILE_TYPES, defaultextension='.csv')
+        if path:
+            self.export_file(path)
 
     def __len__(self):
         """Returns the number of words in the table"""
-        return len(self.__tree.get_children())
+        return len(self.__rows)
 
 
 class WordOptions:
@@ -735,12 +571,14 @@ class WordOptions:
 
 
 class QuizLetWriterApp:
-    def __init__(self, parent):
+    def __init__(self, parent, tracer=None, recorder=None):
         """
         Creates an instance of QuizLetWriterApp
 
         Inputs:
             parent (tk.Tk): a root widget
+            tracer (CommandTracer): records the commands of the webdriver, if given
+            recorder (CommandRecorder): records the commands with their responses for an offline replay, if given
 
         Private attributes:
             pass
@@ -748,8 +586,12 @@ class QuizLetWriterApp:
 
         # Class instances initialization
         self.__word_options = WordOptions(parent)
-        self.__web_driver = WebDriver()
+        self.__settings = Settings()
+        self.__settings.load_file()
+        self.__web_driver = WebDriver(tracer, recorder=recorder, settings=self.__settings)
         self.__user_data = UserData()
+        self.__synced_sets = SyncedSets()
+        self.__synced_sets.load_file()
         self.__user_data_form = UserDataForm(parent, self._userdata_form_ok)
         self.__table = Table(parent)
 
@@ -758,6 +600,10 @@ class QuizLetWriterApp:
         self.__name_e = tk.Entry(parent)
         self.__description_lbl = tk.Label(parent, text="Desription name:", justify=tk.LEFT)
         self.__description_e = tk.Entry(parent)
+        self.__cards_per_set_lbl = tk.Label(parent, text="Cards per set:", justify=tk.LEFT)
+        self.__cards_per_set_e = tk.Entry(parent)
+        validation = (parent.register(lambda text: text == '' or text.isdigit()), '%P')  # Tcl wrapper
+        self.__cards_per_set_e.config(validate='key', validatecommand=validation)
 
         # Buttons initialization
         self.__login_button = tk.Button(parent, text='Log in', command=self._log_in)
@@ -773,17 +619,19 @@ class QuizLetWriterApp:
         self.__name_e.grid(row=0, column=1, columnspan=2, sticky=tk.E + tk.W)
         self.__description_lbl.grid(row=1, column=0)
         self.__description_e.grid(row=1, column=1, columnspan=2, sticky=tk.E + tk.W)
+        self.__cards_per_set_lbl.grid(row=2, column=0)
+        self.__cards_per_set_e.grid(row=2, column=1, columnspan=2, sticky=tk.E + tk.W)
 
         # Placing a table
-        self.__table.grid_table(row=2, column=0, columnspan=3)
+        self.__table.grid_table(row=3, column=0, columnspan=3)
 
         # Placing word options frame's widgets
         # self.__word_options.grid_frame(row=0, column=1, columnspan=3, sticky=tk.N)
 
         # Placing buttons
-        self.__login_button.grid(row=3, column=0, sticky=tk.E + tk.W)
-        self.__load_button.grid(row=3, column=1, sticky=tk.E + tk.W)
-        self.__upload_button.grid(row=3, column=2, sticky=tk.E + tk.W)
+        self.__login_button.grid(row=4, column=0, sticky=tk.E + tk.W)
+        self.__load_button.grid(row=4, column=1, sticky=tk.E + tk.W)
+        self.__upload_button.grid(row=4, column=2, sticky=tk.E + tk.W)
 
     def _load_words(self):
         """Loads words from a file to the table. Assumes that the user is already logged in"""
@@ -792,14 +640,18 @@ class QuizLetWriterApp:
             self.__table.clear()
             file_path = self._get_path()
             words = []
-            definitions = []
             with open(file_path, 'r') as file:
                 for word in file.read().split(self.__word_options.get_separator()):
                     word = word.strip()
                     words.append(word)
 
-            definitions = self.__web_driver.get_definitions(words)
-            self.__table.extend(words, definitions)
+            # The rows are shown as soon as their definitions are found
+            try:
+                for word, definition, _ in self.__web_driver.iter_definitions(words, self.__settings.pipeline):
+                    self.__table.append(word, definition)
+                    self.__load_button.update_idletasks()
+            except NoSuchElementException:
+                messagebox.showerror("Error!", "Web elements could not be found. Retry to upload the words")
 
     def _upload_words(self):
         """Uploads words from a table to QuizLet website"""
@@ -811,10 +663,41 @@ class QuizLetWriterApp:
         if self.__name_e.get() != '':
             quiz_name, quiz_description = self.__name_e.get(), self.__description_e.get()
             words_and_definitions = self.__table.get_words_and_definitions()
-            self.__web_driver.upload_quiz(quiz_name, quiz_description, words_and_definitions)
+            cards_per_set = int(self.__cards_per_set_e.get() or 0)
+            if 0 < cards_per_set < len(words_and_definitions):
+                self._upload_shards(quiz_name, quiz_description, words_and_definitions, cards_per_set)
+                return
+            synced_set = self.__synced_sets.get_set(quiz_name)
+            if synced_set is None:
+                set_id = self.__web_driver.upload_quiz(quiz_name, quiz_description, words_and_definitions,
+                                                       import_mode=True)
+            else:
+                set_id, old_words_and_definitions = synced_set
+                set_id = self.__web_driver.sync_quiz(set_id, quiz_name, quiz_description, old_words_and_definitions,
+                                                     words_and_definitions)
+            if set_id is not None:
+                self.__synced_sets.set_set(quiz_name, set_id, words_and_definitions)
+                self.__synced_sets.save_file()
         else:
             messagebox.showwarning("Title is missing!", "Please insert title for your quiz (description is optional)")
 
+    def _upload_shards(self, quiz_name, quiz_description, words_and_definitions, cards_per_set):
+        """Uploads the words as numbered sets of cards_per_set cards in several sessions and reports their urls"""
+        n_sets = -(-len(words_and_definitions) // cards_per_set)
+        pool = SessionPool(min(n_sets, self.__settings.sessions), *self.__user_data.get_userdata(),
+                           session_factory=lambda: WebDriver(settings=self.__settings))
+        try:
+            pool.start()
+            report = upload_shards(pool, quiz_name, quiz_description, words_and_definitions, cards_per_set,
+                                   self.__synced_sets)
+        except ValueError:
+            messagebox.showerror("Error!", "Provided userdata is not valid. Please, log in again...")
+            return
+        finally:
+            pool.close()
+        self.__synced_sets.save_file()
+        messagebox.showinfo("Uploaded", "\n".join(f"{r['name']}: {r['url'] or r['error']}" for r in report))
+
     def _is_update(self):
         """Returns True, if the table is empty or the user agrees to overwrite the words"""
         if len(self.__table) == 0:
@@ -863,9 +746,24 @@ class QuizLetWriterApp:
 
 
 def main():
+    # The commands of the webdriver are traced into the file given by QUIZLET_WRITER_TRACE
+    trace_path = os.environ.get('QUIZLET_WRITER_TRACE')
+    tracer = CommandTracer() if trace_path else None
+    # and recorded for an offline replay into the file given by QUIZLET_WRITER_RECORD
+    record_path = os.environ.get('QUIZLET_WRITER_RECORD')
+    recorder = CommandRecorder(snapshots=True) if record_path else None
     root = tk.Tk()
-    QuizLetWriterApp(root)
+    QuizLetWriterApp(root, tracer, recorder)
+    # The stalls of the main loop longer than QUIZLET_WRITER_WATCHDOG milliseconds are logged with their stacks
+    watchdog_threshold = os.environ.get('QUIZLET_WRITER_WATCHDOG')
+    if watchdog_threshold:
+        logging.basicConfig()
+        StallWatchdog(root, threshold=int(watchdog_threshold) / 1000).start()
     root.mainloop()
+    if tracer is not None:
+        tracer.save(trace_path)
+    if recorder is not None:
+        recorder.save(record_path)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,83 @@
+"""
+Tools for the definition snapshots, which seed a fresh worker with the definitions, which the others already found
+
+    python -m quizlet_writer.snapshots merge fleet.json.gz box1.json.gz box2.json.gz
+    python -m quizlet_writer.snapshots import fleet.json.gz results.jsonl
+    python -m quizlet_writer.snapshots show fleet.json.gz
+
+merge and import add to the output snapshot, if it exists. A daemon started with `--cache fleet.json.gz` looks up only
+the words, which aren't in the snapshot.
+"""
+
+import argparse
+import os
+import sys
+from collections import Counter
+
+from .core import DefinitionCache, read_definitions
+
+
+def merge_snapshots(output, paths):
+    """Merges the snapshots into the output snapshot and returns the cache. Raises ValueError for a bad snapshot"""
+    cache = DefinitionCache()
+    cache.load_file(output)
+    for path in paths:
+        if not os.path.exists(path):
+            raise ValueError(f"{path} doesn't exist")
+        cache.load_file(path)
+    cache.save_file(output)
+    return cache
+
+
+def import_results(output, paths, source=None):
+    """
+    Adds the found definitions of DefinitionSink files (.jsonl or .csv) to the output snapshot and returns the cache.
+    The entries get the modification time of their file, since the records have no time of their own
+    """
+    cache = DefinitionCache(source)
+    cache.load_file(output)
+    for path in paths:
+        timestamp = os.path.getmtime(path)
+        for word, definition in read_definitions(path).items():
+            if definition is not None:
+                cache.put(word, definition, [definition], timestamp)
+    cache.save_file(output)
+    return cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merges and inspects the definition snapshots")
+    commands = parser.add_subparsers(dest='command', required=True)
+    merge = commands.add_parser('merge', help="merge snapshots into the output snapshot")
+    merge.add_argument('output')
+    merge.add_argument('snapshots', nargs='+')
+    import_ = commands.add_parser('import', help="add the results of lookups (.jsonl or .csv) to the output snapshot")
+    import_.add_argument('output')
+    import_.add_argument('results', nargs='+')
+    import_.add_argument('--source', default=None, help="the machine, which found the results. This one by default")
+    show = commands.add_parser('show', help="print the number of definitions of every source")
+    show.add_argument('snapshot')
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'merge':
+            cache = merge_snapshots(args.output, args.snapshots)
+        elif args.command == 'import':
+            cache = import_results(args.output, args.results, args.source)
+        else:
+            if not os.path.exists(args.snapshot):
+                raise ValueError(f"{args.snapshot} doesn't exist")
+            cache = DefinitionCache()
+            cache.load_file(args.snapshot)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+
+    sources = Counter(entry[3] for entry in cache.entries().values())
+    for source, n in sorted(sources.items()):
+        print(f"{source}: {n}")
+    print(f"total: {len(cache)}")
+
+
+if __name__ == '__main__':
+    main()
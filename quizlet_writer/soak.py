@@ -0,0 +1,364 @@
+"""
+A soak test, which runs log in -> get definitions -> upload cycles for a long time and watches the memory of Python
+and Chrome and the latency of the WebDriver for growth
+
+Run it with `python -m quizlet_writer.soak --minutes 120` against a local stand-in of the Quizlet pages, or with
+`--real` against quizlet.com with the account from user_data.txt. Every cycle prints a sample. The run fails with exit
+code 1, if the last samples grew more than the thresholds compared to the first ones.
+"""
+
+import argparse
+import gc
+import itertools
+import json
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from .core import UserData, WebDriver
+
+# The pages of the stand-in site. They have the elements, which the Locators look for, and behave like the Quizlet
+# pages as far as the WebDriver can tell
+HOME_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Stand-in Quizlet</title></head><body>
+<div class="SiteNavLoginSection"><button aria-label="Log in" onclick="openLogIn()">Log in</button></div>
+<div id="modal" style="display: none">
+  <form class="LoginPromptModal-form" onsubmit="return false;">
+    <label class="AssemblyInput AssemblyInput--filled" aria-invalid="false">Username <input id="username"></label>
+    <label class="AssemblyInput AssemblyInput--filled" aria-invalid="false">Password <input id="password"
+        type="password"></label>
+    <button type="button" aria-label="Log in" onclick="logIn()">Log in</button>
+  </form>
+</div>
+<script>
+var USERDATA = %(userdata)s;
+
+function openLogIn() {
+    document.getElementById('modal').style.display = 'block';
+}
+
+function logIn() {
+    var username = document.getElementById('username').value, password = document.getElementById('password').value;
+    setTimeout(function () {
+        if (username === USERDATA[0] && password === USERDATA[1]) {
+            location.href = '/latest';
+            return;
+        }
+        var labels = document.querySelectorAll('form label');
+        for (var i = 0; i < labels.length; i++) {
+            labels[i].setAttribute('aria-invalid', 'true');
+        }
+    }, %(latency)d);
+}
+</script>
+</body></html>
+"""
+
+NEW_SET_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Create a new study set</title></head><body>
+<div class="CreateSetHeader-headingContent">
+  <textarea placeholder="Enter a title, like “Biology - Chapter 22: Evolution”"></textarea>
+  <textarea placeholder="Add a description..."></textarea>
+</div>
+<button aria-label="+ Import from Word, Excel, Google Docs, etc." onclick="openImport()">+ Import</button>
+<div class="ImportTerms" style="display: none">
+  <textarea></textarea>
+  <button aria-label="Import" onclick="importTerms()">Import</button>
+</div>
+<div class="TermRows" id="rows"></div>
+<button aria-label="+ Add card" onclick="addRow()">+ Add card</button>
+<button aria-label="Create" onclick="createSet()">Create</button>
+<script>
+var nextRow = 0;
+
+function addRow() {
+    var wrap = document.createElement('div');
+    wrap.className = 'TermRows-termRowWrap';
+    wrap.innerHTML = '<div data-term-luid="term-' + nextRow++ + '">' +
+        '<div aria-labelledby="editor-term-side" contenteditable="true"></div>' +
+        '<div aria-labelledby="editor-definition-side" contenteditable="true"></div>' +
+        '<div class="AutosuggestContext-suggestions"></div>' +
+        '<button aria-label="Delete this card" onclick="this.parentNode.parentNode.remove()">-</button>' +
+        '</div>';
+    var row = wrap.firstChild, term = row.children[0], suggestions = row.children[2];
+    row.children[1].addEventListener('focus', function () {
+        var word = term.innerText.trim();
+        if (word === '') {
+            return;
+        }
+        fetch('/suggest?term=' + encodeURIComponent(word)).then(function (r) { return r.json(); }).then(
+            function (defs) {
+                suggestions.innerHTML = '';
+                defs.forEach(function (d) {
+                    var line = document.createElement('div');
+                    line.textContent = d;
+                    suggestions.appendChild(line);
+                });
+            });
+    });
+    document.getElementById('rows').appendChild(wrap);
+    return row;
+}
+
+function openImport() {
+    document.querySelector('.ImportTerms').style.display = 'block';
+}
+
+function importTerms() {
+    var box = document.querySelector('.ImportTerms');
+    var lines = box.querySelector('textarea').value.split('\\n');
+    var rows = document.querySelectorAll('.TermRows-termRowWrap > div');
+    lines.forEach(function (line, i) {
+        var fields = line.split('\\t');
+        var row = i < rows.length ? rows[i] : addRow();
+        row.children[0].innerText = fields[0];
+        row.children[1].innerText = fields.length > 1 ? fields[1] : '';
+    });
+    box.style.display = 'none';
+}
+
+function createSet() {
+    var title = document.querySelector('.CreateSetHeader-headingContent textarea').value;
+    fetch('/sets', {method: 'POST', body: title}).then(function (r) { return r.json(); }).then(function (set) {
+        location.href = '/' + set.id + '/set-flash-cards/';
+    });
+}
+
+for (var i = 0; i < 2; i++) {
+    addRow();
+}
+</script>
+</body></html>
+"""
+
+PLAIN_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>%(title)s</title></head><body><h1>%(title)s</h1></body></html>
+"""
+
+
+class StandInSite:
+    """
+    A local HTTP server, which stands in for quizlet.com: the home page with the log in form, the new set page with
+    the auto-suggestions and the set pages. The suggestions arrive after latency seconds, like from the real site
+    """
+
+    def __init__(self, username='user', password='password', latency=0.1, port=0):
+        """
+        Inputs:
+        username, password (str): the userdata, which the log in form accepts
+        latency (float): the seconds, after which the log in and the suggestions respond
+        port (int): the localhost port to listen on. A free one is chosen if 0
+        """
+        self.username = username
+        self.password = password
+        self.latency = latency
+        self.set_ids = itertools.count(100000001)
+        self.__server = ThreadingHTTPServer(('127.0.0.1', port), StandInRequestHandler)
+        self.__server.site = self
+        self.__thread = threading.Thread(target=self.__server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        """The address of the site, which is passed to WebDriver"""
+        return f"http://127.0.0.1:{self.__server.server_address[1]}/"
+
+    @staticmethod
+    def suggest(term):
+        """Returns the suggested definitions of a term. They are made up, but differ for every term"""
+        return [f"{term}", f"the meaning of {term}", f"{term}: a word, which is looked up by the soak test"]
+
+    def start(self):
+        """Starts serving the pages on another thread"""
+        self.__thread.start()
+
+    def close(self):
+        """Stops the server"""
+        self.__server.shutdown()
+        self.__server.server_close()
+
+
+class StandInRequestHandler(BaseHTTPRequestHandler):
+    """Serves the pages of the StandInSite, which is stored in server.site"""
+
+    def do_GET(self):
+        site = self.server.site
+        url = urlparse(self.path)
+        if url.path == '/':
+            userdata = json.dumps([site.username, site.password])
+            self._send(200, HOME_PAGE % {'userdata': userdata, 'latency': site.latency * 1000})
+        elif url.path == '/create-set':
+            self._send(200, NEW_SET_PAGE)
+        elif url.path == '/suggest':
+            time.sleep(site.latency)
+            term = parse_qs(url.query).get('term', [''])[0]
+            self._send(200, json.dumps(site.suggest(term)), 'application/json')
+        elif url.path == '/latest':
+            self._send(200, PLAIN_PAGE % {'title': 'Latest'})
+        elif url.path.split('/')[1].isdigit():
+            self._send(200, PLAIN_PAGE % {'title': 'Set ' + url.path.split('/')[1]})
+        else:
+            self._send(404, PLAIN_PAGE % {'title': 'Not found'})
+
+    def do_POST(self):
+        if self.path != '/sets':
+            self._send(404, PLAIN_PAGE % {'title': 'Not found'})
+            return
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self._send(200, json.dumps({'id': next(self.server.site.set_ids)}), 'application/json')
+
+    def _send(self, code, body, content_type='text/html'):
+        """Sends a UTF-8 response"""
+        data = body.encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # The soak test prints its own samples, the requests would drown them
+        pass
+
+
+def run_soak(web_driver, username, password, words, cycles=None, duration=None, on_sample=None):
+    """
+    Runs log in -> get_definitions -> upload_quiz cycles and returns a list with a sample per cycle:
+    {'cycle', 'time', 'python_heap', 'chrome_rss', 'log_in', 'get_definitions', 'upload_quiz'}. The memory is in
+    bytes (chrome_rss is None without psutil), the time and the latencies in seconds, get_definitions per word
+
+    Inputs:
+    web_driver (WebDriver): the session, which is soaked
+    username, password (str): the userdata
+    words (list): the words, which are looked up and uploaded in every cycle
+    cycles (int): the number of cycles. Unlimited if None
+    duration (float): the seconds, after which no more cycles are started. Unlimited if None
+    on_sample (callable): is called with every sample as soon as it's taken
+    """
+    assert cycles is not None or duration is not None, "Soak should be limited by cycles or duration"
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    samples = []
+    start = time.monotonic()
+    try:
+        for cycle in itertools.count():
+            if (cycles is not None and cycle >= cycles) or (duration is not None and
+                                                            time.monotonic() - start >= duration):
+                break
+            t0 = time.perf_counter()
+            if not web_driver.log_in(username, password):
+                raise ValueError("Provided userdata is not valid")
+            t1 = time.perf_counter()
+            definitions = web_driver.get_definitions(words)
+            t2 = time.perf_counter()
+            rows = [(w, d if d is not None else 'Not found') for w, d in zip(words, definitions)]
+            web_driver.upload_quiz(f"Soak {cycle}", '', rows, import_mode=True)
+            t3 = time.perf_counter()
+
+            # The garbage is collected first, so only the memory, which is still referenced, is counted
+            gc.collect()
+            sample = {'cycle': cycle, 'time': time.monotonic() - start,
+                      'python_heap': tracemalloc.get_traced_memory()[0], 'chrome_rss': web_driver.memory_usage(),
+                      'log_in': t1 - t0, 'get_definitions': (t2 - t1) / max(len(words), 1), 'upload_quiz': t3 - t2}
+            samples.append(sample)
+            if on_sample is not None:
+                on_sample(sample)
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+    return samples
+
+
+def check_drift(samples, window=5, warmup=1, max_heap_growth=0.25, max_rss_growth=0.5, max_latency_drift=0.5):
+    """
+    Compares the medians of the last window samples with the medians of the first window samples after the warmup
+    ones and returns a list with a message per metric, which grew more than its threshold. Raises ValueError, if there
+    are fewer than warmup + 2 * window samples
+
+    Inputs:
+    samples (list): the samples of run_soak
+    window (int): the number of samples in the first and the last window
+    warmup (int): the number of first samples, which are skipped, since the caches are still filling
+    max_heap_growth, max_rss_growth (float): the allowed growth of the Python heap and Chrome memory. 0.25 is 25%
+    max_latency_drift (float): the allowed growth of every latency
+    """
+    samples = samples[warmup:]
+    if len(samples) < 2 * window:
+        raise ValueError(f"Soak should have at least {warmup + 2 * window} samples to be checked")
+
+    thresholds = {'python_heap': max_heap_growth, 'chrome_rss': max_rss_growth, 'log_in': max_latency_drift,
+                  'get_definitions': max_latency_drift, 'upload_quiz': max_latency_drift}
+    problems = []
+    for metric, threshold in thresholds.items():
+        first = [s[metric] for s in samples[:window] if s[metric] is not None]
+        last = [s[metric] for s in samples[-window:] if s[metric] is not None]
+        if not first or not last:
+            continue
+        before, after = statistics.median(first), statistics.median(last)
+        if before > 0 and after / before - 1 > threshold:
+            problems.append(f"{metric} grew by {after / before - 1:.0%} ({before:.6g} -> {after:.6g}), "
+                            f"more than {threshold:.0%}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soaks a Quizlet Writer session and checks it for memory and latency "
+                                                 "growth")
+    parser.add_argument('--real', action='store_true', help="use quizlet.com and user_data.txt instead of a stand-in")
+    parser.add_argument('--cycles', type=int, default=None, help="the number of cycles")
+    parser.add_argument('--minutes', type=float, default=None, help="the duration of the soak")
+    parser.add_argument('--words', type=int, default=20, help="the number of words in a cycle")
+    parser.add_argument('--latency-ms', type=int, default=100, help="the response time of the stand-in site")
+    parser.add_argument('--window', type=int, default=5, help="the number of samples, which are compared")
+    parser.add_argument('--warmup', type=int, default=1, help="the number of first samples, which are skipped")
+    parser.add_argument('--max-heap-growth', type=float, default=0.25, help="the allowed Python heap growth")
+    parser.add_argument('--max-rss-growth', type=float, default=0.5, help="the allowed Chrome memory growth")
+    parser.add_argument('--max-latency-drift', type=float, default=0.5, help="the allowed latency growth")
+    parser.add_argument('--output', default=None, help="a JSONL file, which the samples are written to")
+    args = parser.parse_args()
+    if args.cycles is None and args.minutes is None:
+        args.cycles = args.warmup + 2 * args.window
+
+    site = None
+    if args.real:
+        user_data = UserData()
+        user_data.update_userdata()
+        username, password = user_data.get_userdata()
+        web_driver = WebDriver()
+    else:
+        site = StandInSite(latency=args.latency_ms / 1000)
+        site.start()
+        username, password = site.username, site.password
+        web_driver = WebDriver(base_url=site.base_url)
+    output = open(args.output, 'a', encoding='utf-8') if args.output else None
+
+    def on_sample(sample):
+        print(json.dumps(sample))
+        if output is not None:
+            output.write(json.dumps(sample) + '\n')
+            output.flush()
+
+    try:
+        words = [f"word{i}" for i in range(args.words)]
+        duration = args.minutes * 60 if args.minutes is not None else None
+        samples = run_soak(web_driver, username, password, words, args.cycles, duration, on_sample)
+    finally:
+        web_driver.quit()
+        if site is not None:
+            site.close()
+        if output is not None:
+            output.close()
+
+    problems = check_drift(samples, args.window, args.warmup, args.max_heap_growth, args.max_rss_growth,
+                           args.max_latency_drift)
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""
+A tuner, which measures the lookup and the upload of a calibration word list with different performance settings and
+writes the fastest ones into the settings file, which every WebDriver loads at startup
+
+Run it with `--real` against quizlet.com with the account from user_data.txt. Only this run writes the settings file
+(settings.json) and searches the settings, which depend on the site: the timeouts of the notification and of the
+suggestions and headless mode (quizlet.com doesn't let Chrome log in headless). The uploads of a real run are made only
+with `--upload`, since every trial creates sets on the account.
+
+Without `--real` the tuner runs against a local stand-in of the Quizlet pages, searches only the settings of this
+machine and writes them into settings.stand-in.json, so a trial run never replaces the settings of real runs.
+
+The settings are searched one at a time: every value of a setting is measured with the best values found so far for
+the others. wait_timeout and add_card_timeout aren't searched: they only bound the waits for elements, which show up as
+soon as the page is ready, so they change how long a failure takes, not how fast a run is.
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .core import SessionPool, Settings, UserData, WebDriver
+from .soak import StandInSite
+
+# The values, which the tuner tries for the settings of this machine
+SEARCH_SPACE = {
+    'poll_frequency': [0.1, 0.25, 0.5],
+    'pipeline': [1, 2, 4],
+    'sessions': [1, 2, 4],
+}
+
+# The values of the settings, which depend on the site. They are searched only against quizlet.com
+SITE_SEARCH_SPACE = {
+    'notification_timeout': [0.5, 1, 2],
+    'suggestion_timeout': [2, 4],
+    'headless': [False, True],
+}
+
+# The file of the settings, which were measured on the stand-in site
+STAND_IN_FILE_NAME = "settings.stand-in.json"
+
+
+def measure(settings, username, password, words, base_url=None, upload=True):
+    """
+    Looks the words up with the given settings, uploads every session's part as a set, if upload is True, and returns a
+    tuple (number of found definitions, seconds). The words are split between settings.sessions sessions. The startup
+    and the log in of the sessions aren't measured
+
+    Raises ValueError, if the sessions can't log in with the settings (e.g. quizlet.com in headless mode)
+    """
+    pool = SessionPool(settings.sessions, username, password,
+                       session_factory=lambda: WebDriver(base_url=base_url, settings=settings))
+    try:
+        pool.start()
+        parts = [words[i::settings.sessions] for i in range(settings.sessions)]
+
+        def look_up(part):
+            session = pool.acquire()
+            try:
+                definitions = session.get_definitions(part, settings.pipeline)
+                if upload:
+                    rows = [(w, d if d is not None else 'Not found') for w, d in zip(part, definitions)]
+                    session.upload_quiz("Quizlet Writer calibration", '', rows, import_mode=True)
+                return sum(d is not None for d in definitions)
+            finally:
+                pool.release(session, 2 if upload else 1)
+
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=settings.sessions) as executor:
+            found = sum(executor.map(look_up, parts))
+        return found, time.perf_counter() - t0
+    finally:
+        pool.close()
+
+
+def tune(measure, settings, space=None, on_trial=None):
+    """
+    Returns a tuple (best settings, their result) after searching the space one setting at a time
+
+    Inputs:
+    measure (callable): returns a tuple (number of found definitions, seconds) for settings. A trial, which raises an
+        exception, is skipped
+    settings (Settings): the settings to start from. They have to work
+    space (dict): {setting: values to try}. SEARCH_SPACE if None
+    on_trial (callable): is called with the settings and the result of every trial. The result is None for a failed
+        trial
+    """
+    best, best_result = settings, measure(settings)
+    if on_trial is not None:
+        on_trial(best, best_result)
+    for name, values in (space or SEARCH_SPACE).items():
+        for value in values:
+            if getattr(best, name) == value:
+                continue
+            candidate = best.copy(**{name: value})
+            try:
+                result = measure(candidate)
+            except Exception:
+                # A browser, which fails with a setting, rules the setting out
+                result = None
+            if on_trial is not None:
+                on_trial(candidate, result)
+            # Faster settings have to find as many definitions, otherwise they only gave up earlier
+            if result is not None and (result[0], -result[1]) > (best_result[0], -best_result[1]):
+                best, best_result = candidate, result
+    return best, best_result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Finds the fastest Quizlet Writer settings on this machine")
+    parser.add_argument('--real', action='store_true', help="use quizlet.com and user_data.txt instead of a stand-in")
+    parser.add_argument('--words', type=int, default=20, help="the number of words in the calibration list")
+    parser.add_argument('--latency-ms', type=int, default=100, help="the response time of the stand-in site")
+    parser.add_argument('--upload', action='store_true', help="measure the uploads in a real run as well")
+    parser.add_argument('--output', default=None,
+                        help=f"the settings file to write. {Settings.FILE_NAME} with --real, {STAND_IN_FILE_NAME} "
+                             f"otherwise")
+    args = parser.parse_args()
+    output = args.output or (Settings.FILE_NAME if args.real else STAND_IN_FILE_NAME)
+    if not args.real and output == Settings.FILE_NAME:
+        sys.exit(f"The stand-in settings can't be written to {Settings.FILE_NAME}, which the real runs load")
+
+    # The search starts from the settings, which the real runs use now
+    settings = Settings()
+    settings.load_file()
+    space = dict(SEARCH_SPACE, **SITE_SEARCH_SPACE) if args.real else SEARCH_SPACE
+    site = None
+    if args.real:
+        user_data = UserData()
+        user_data.update_userdata()
+        username, password = user_data.get_userdata()
+        base_url = None
+    else:
+        site = StandInSite(latency=args.latency_ms / 1000)
+        site.start()
+        username, password, base_url = site.username, site.password, site.base_url
+
+    def on_trial(trial, result):
+        print(trial, f"{result[0]} found in {result[1]:.2f} s" if result is not None else "failed")
+
+    words = [f"word{i}" for i in range(args.words)]
+    try:
+        upload = args.upload or not args.real
+        best, (found, seconds) = tune(lambda s: measure(s, username, password, words, base_url, upload), settings,
+                                      space, on_trial)
+    finally:
+        if site is not None:
+            site.close()
+    best.save_file(output)
+    print(f"Best: {best}, {found} found in {seconds:.2f} s. Written to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""A watchdog, which reports the stalls of the Tk main loop with the Python stack of the call, which blocked it"""
+
+import logging
+import sys
+import threading
+import time
+import traceback
+
+logger = logging.getLogger(__name__)
+
+
+class StallWatchdog:
+    """
+    Measures the responsiveness of the Tk main loop. The main loop beats every interval seconds through after(), and
+    a side thread checks the beats. If no beat came for threshold seconds, the stack of the main thread is logged as a
+    warning, since it shows the call, which blocks the window. The end of a stall is logged with its duration
+    """
+
+    def __init__(self, widget, threshold=0.2, interval=0.05):
+        """
+        Inputs:
+        widget (tk.Misc): any widget of the main loop, which is watched
+        threshold (float): the seconds without a beat, after which the main loop counts as stalled
+        interval (float): the seconds between the beats
+        """
+        self.__widget = widget
+        self.__threshold = threshold
+        self.__interval = interval
+        self.__last_beat = time.monotonic()
+        self.__main_thread = None
+        self.__after_id = None
+        self.__stopped = threading.Event()
+        self.__stack = None
+        self.__stalls = []
+        self.__lock = threading.Lock()
+
+    def start(self):
+        """Starts the beats and the side thread. Has to be called on the thread of the main loop"""
+        self.__main_thread = threading.get_ident()
+        self.__last_beat = time.monotonic()
+        self.__after_id = self.__widget.after(int(self.__interval * 1000), self._beat)
+        threading.Thread(target=self._watch, daemon=True).start()
+
+    def stop(self):
+        """Stops watching"""
+        self.__stopped.set()
+        if self.__after_id is not None:
+            self.__widget.after_cancel(self.__after_id)
+            self.__after_id = None
+
+    def stalls(self):
+        """Returns a list of (duration in seconds, stack) of the stalls, which ended"""
+        with self.__lock:
+            return list(self.__stalls)
+
+    def _beat(self):
+        """Runs on the main loop. Marks it as responsive and ends a stall, if there was one"""
+        now = time.monotonic()
+        with self.__lock:
+            stack, self.__stack = self.__stack, None
+            duration = now - self.__last_beat - self.__interval
+            self.__last_beat = now
+            if stack is not None:
+                self.__stalls.append((duration, stack))
+        if stack is not None:
+            logger.warning("UI stall ended after %.3f s", duration)
+        if not self.__stopped.is_set():
+            self.__after_id = self.__widget.after(int(self.__interval * 1000), self._beat)
+
+    def _watch(self):
+        """Runs on the side thread. Catches the main thread in the middle of a stall"""
+        while not self.__stopped.wait(self.__interval / 2):
+            with self.__lock:
+                lag = time.monotonic() - self.__last_beat - self.__interval
+                if lag < self.__threshold or self.__stack is not None:
+                    continue
+                frame = sys._current_frames().get(self.__main_thread)
+                self.__stack = ''.join(traceback.format_stack(frame)) if frame is not None else ''
+                stack = self.__stack
+            logger.warning("UI stalled for more than %.3f s in:\n%s", lag, stack)
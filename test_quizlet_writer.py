@@ -1,7 +1,743 @@
+import gzip
+import itertools
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
 import time
+import tkinter as tk
 from unittest import TestCase
 
 from quizlet_writer import *
+from quizlet_writer.daemon import FairJobQueue, JobDaemon, _save_periodically
+from quizlet_writer.soak import StandInSite, check_drift
+from quizlet_writer.tune import SEARCH_SPACE, SITE_SEARCH_SPACE, tune
+from quizlet_writer.watchdog import StallWatchdog
+from selenium.common.exceptions import ElementClickInterceptedException, ElementNotInteractableException, \
+    NoSuchElementException, StaleElementReferenceException, WebDriverException
+from selenium.webdriver.common.keys import Keys
+
+
+class FakeElement:
+    """A web element of FakeDriver"""
+    ids = iter(range(10 ** 9))
+
+    def __init__(self, text='', on_click=None, children=None, attributes=None):
+        self.id = f"element-{next(FakeElement.ids)}"
+        self.text = text
+        self.on_click = on_click
+        self.children = children or {}
+        self.attributes = attributes or {}
+        self.stale = False
+        self.clicks = 0
+
+    def _check(self):
+        if self.stale:
+            raise StaleElementReferenceException("The element is stale")
+
+    def click(self):
+        self._check()
+        self.clicks += 1
+        if self.on_click is not None:
+            self.on_click()
+
+    def send_keys(self, *keys):
+        self._check()
+        self.text = '' if Keys.DELETE in keys else self.text + ''.join(keys)
+
+    def clear(self):
+        self._check()
+        self.text = ''
+
+    def is_displayed(self):
+        self._check()
+        return True
+
+    def is_enabled(self):
+        self._check()
+        return True
+
+    def get_attribute(self, name):
+        self._check()
+        return self.attributes.get(name)
+
+    def find_element(self, by, value):
+        self._check()
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(value)
+        return elements[0]
+
+    def find_elements(self, by, value):
+        self._check()
+        return list(self.children.get(value, []))
+
+
+class FakeDriver(FakeElement):
+    """An offline stand-in for a selenium driver, which serves the elements from a dictionary {selector: [element]}"""
+
+    class SwitchTo:
+        def window(self, handle):
+            pass
+
+    def __init__(self, url='https://quizlet.com/', children=None, implicit_waits=False):
+        super().__init__(children=children)
+        # With implicit_waits a search, which finds nothing, takes the implicit wait like in a browser
+        self.implicit_waits = implicit_waits
+        self.implicit_wait = 0
+        self.current_url = url
+        self.current_window_handle = 'window-0'
+        self.switch_to = FakeDriver.SwitchTo()
+        self.finds = 0
+
+    def find_elements(self, by, value):
+        self.finds += 1
+        elements = super().find_elements(by, value)
+        if not elements and self.implicit_waits:
+            time.sleep(self.implicit_wait)
+        return elements
+
+    def get(self, url):
+        self.current_url = url
+
+    def set_window_rect(self, x, y):
+        pass
+
+    def implicitly_wait(self, seconds):
+        self.implicit_wait = seconds
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def execute_async_script(self, script, *args):
+        return self.async_script(*args)
+
+
+class TestImportTime(TestCase):
+    def test_core_import(self):
+        # The core has to be importable without tkinter and the selenium webdriver package
+        code = "import sys, time\n" \
+               "t0 = time.perf_counter()\n" \
+               "import {}\n" \
+               "print(time.perf_counter() - t0, 'tkinter' in sys.modules, 'selenium.webdriver' in sys.modules)"
+
+        def import_time(modules):
+            output = subprocess.run([sys.executable, '-c', code.format(modules)], capture_output=True, text=True,
+                                    check=True).stdout.split()
+            return float(output[0]), output[1:]
+
+        core_time, loaded = import_time('quizlet_writer.core')
+        assert loaded == ['False', 'False'], "The core shouldn't import tkinter or the selenium webdriver package"
+
+        # Budget: the core has to import in less than half the time of the dependencies, which the single module
+        # used to import at the top
+        eager_time, _ = import_time('tkinter, selenium.webdriver, selenium.webdriver.support.ui')
+        assert core_time < eager_time / 2, f"The core took {core_time:.3f} s, the eager imports {eager_time:.3f} s"
+
+
+class TestElementCache(TestCase):
+    @staticmethod
+    def make_row():
+        entry = FakeElement()
+        return FakeElement(children={Locators.TERM_ENTRY[1]: [entry]}), entry
+
+    def test_cached_handles_and_stale_re_resolution(self):
+        row, entry = self.make_row()
+        driver = FakeDriver(children={Locators.FIRST_TERM_ROW[1]: [row]})
+        cache = ElementCache(driver)
+
+        # Case 1: Handles are resolved once per page
+        for word in ('Tree', 'Water'):
+            cache.act(Locators.TERM_ENTRY, lambda e: e.send_keys(word), Locators.FIRST_TERM_ROW)
+        assert entry.text == 'TreeWater' and driver.finds == 1, "The row has to be found only once"
+
+        # Case 2: The row is re-rendered, so the old handles are stale. Both are re-resolved and the action retried
+        row.stale = entry.stale = True
+        new_row, new_entry = self.make_row()
+        driver.children[Locators.FIRST_TERM_ROW[1]] = [new_row]
+        cache.act(Locators.TERM_ENTRY, lambda e: e.send_keys('Jacket'), Locators.FIRST_TERM_ROW)
+        assert new_entry.text == 'Jacket' and driver.finds == 2
+
+        # Case 3: After a navigation everything is resolved again
+        cache.invalidate()
+        assert cache.find(Locators.FIRST_TERM_ROW) is new_row and driver.finds == 3
+
+
+class TestGetTermEntries(TestCase):
+    def test_lost_and_intercepted_clicks(self):
+        driver = FakeDriver('https://quizlet.com/create-set')
+        for locator in (Locators.TERM_ROWS, Locators.TERM_ENTRY, Locators.DEFINITION_ENTRY):
+            driver.children[locator[1]] = [FakeElement(), FakeElement()]
+        clicks = []
+
+        def add_card():
+            clicks.append(1)
+            if len(clicks) == 2:
+                raise ElementClickInterceptedException("A notification covers the button")
+            if len(clicks) == 4:
+                return  # The click didn't add a row
+            for locator in (Locators.TERM_ROWS, Locators.TERM_ENTRY, Locators.DEFINITION_ENTRY):
+                driver.children[locator[1]].append(FakeElement())
+
+        driver.children[Locators.ADD_CARD_BUTTON[1]] = [FakeElement(on_click=add_card)]
+        term_entries = WebDriver(driver=driver)._get_term_entries(5)
+        assert len(term_entries) == 5, "The row of the lost click has to be added in another round"
+        assert len(clicks) == 5, "3 rows are added with 5 clicks: one is intercepted and one is lost"
+
+
+class TestSubmitSet(TestCase):
+    def test_submit_set_returns_set_id(self):
+        for base_url in (None, 'http://127.0.0.1:8080'):
+            site = base_url + '/' if base_url else 'https://quizlet.com/'
+            driver = FakeDriver(site + 'create-set')
+
+            def create():
+                driver.current_url = site + '123456789/nature-flash-cards/'
+
+            driver.children[Locators.CREATE_SET_BUTTON[1]] = [FakeElement(on_click=create)]
+            web_driver = WebDriver(driver=driver, base_url=base_url)
+            assert web_driver._submit_set(Locators.CREATE_SET_BUTTON) == '123456789'
+            assert web_driver._page(WebDriver.NEW_QUIZ_PAGE) == site + 'create-set'
+
+
+class TestSyncQuiz(TestCase):
+    class WebDriver(WebDriver):
+        def _upload_quiz(self, quiz_name, quiz_description, words_and_definitions, import_mode):
+            return 'new-set'
+
+        def _get_quiz_entries(self):
+            raise LookupError("The set is edited")
+
+    def test_set_edited_on_the_site(self):
+        old = [('Tree', 'a plant'), ('Water', 'H2O'), ('Fire', 'flames')]
+        new = [('Tree', 'a plant'), ('Fire', 'flames')]
+        for page_words, edited in ((['Tree', 'Water'], True), (['Tree', 'Sun', 'Fire'], True),
+                                   (['Tree', 'Water', 'Fire'], False)):
+            rows = [FakeElement(children={Locators.TERM_ENTRY[1]: [FakeElement(w)]}) for w in page_words]
+            web_driver = self.WebDriver(driver=FakeDriver(children={Locators.TERM_ROWS[1]: rows}))
+            if edited:
+                assert web_driver.sync_quiz('123', 'Nature', '', old, new) == 'new-set', page_words
+            else:
+                with self.assertRaises(LookupError):
+                    web_driver.sync_quiz('123', 'Nature', '', old, new)
+
+
+class TestLogInOutcome(TestCase):
+    @staticmethod
+    def make_driver(on_log_in):
+        driver = FakeDriver()
+        form = FakeElement(children={Locators.USERNAME_ENTRY[1]: [FakeElement()],
+                                     Locators.PASSWORD_ENTRY[1]: [FakeElement()]})
+        labels = [FakeElement(attributes={'aria-invalid': 'false'}) for _ in range(2)]
+        driver.children.update({
+            Locators.LOG_IN_BUTTON[1]: [FakeElement()], Locators.LOG_IN_FORM[1]: [form],
+            Locators.LOG_IN_FORM_LABELS[1]: labels,
+            # The site answers 0.2 s after the click
+            Locators.LOG_IN_FORM_BUTTON[1]: [FakeElement(on_click=lambda: threading.Timer(0.2, on_log_in).start())]
+        })
+        return driver, labels
+
+    def test_first_outcome_decides(self):
+        def redirect():
+            driver.current_url = 'https://quizlet.com/latest'
+
+        def error():
+            labels[1].attributes['aria-invalid'] = 'true'
+
+        def close():
+            driver.children[Locators.LOG_IN_FORM[1]] = []
+
+        for on_log_in, expected in ((redirect, True), (error, False), (close, True)):
+            driver, labels = self.make_driver(on_log_in)
+            web_driver = WebDriver(driver=driver, settings=Settings(log_in_timeout=3))
+            assert web_driver.log_in('user', 'password') is expected, on_log_in.__name__
+            # The outcome is seen within a few polls instead of after the whole log in timeout
+            assert 0.2 <= web_driver.get_login_latency() < 1, on_log_in.__name__
+
+    def test_implicit_wait_of_a_lookup(self):
+        def redirect():
+            driver.current_url = 'https://quizlet.com/latest'
+            driver.children[Locators.LOG_IN_FORM[1]] = []
+
+        driver, _ = self.make_driver(redirect)
+        driver.implicit_waits = True
+        web_driver = WebDriver(driver=driver, settings=Settings(log_in_timeout=3))
+        # A lookup left an implicit wait of 2 s behind
+        web_driver._implicitly_wait(2)
+        assert web_driver.log_in('user', 'password') is True
+        assert web_driver.get_login_latency() < 1 and driver.implicit_wait == 2
+
+    def test_no_outcome(self):
+        driver, _ = self.make_driver(lambda: None)
+        web_driver = WebDriver(driver=driver, settings=Settings(log_in_timeout=0.5))
+        assert web_driver.log_in('user', 'password') is False
+        assert web_driver.get_login_latency() >= 0.5
+
+
+class TestIterDefinitions(TestCase):
+    SUGGESTIONS = {'Tree': ['a plant', 'a woody perennial plant'], 'Water': ['H2O']}
+
+    def make_driver(self):
+        entry, definition = FakeElement(), FakeElement()
+        row = FakeElement(children={Locators.TERM_ENTRY[1]: [entry], Locators.DEFINITION_ENTRY[1]: [definition]})
+        driver = FakeDriver(children={Locators.FIRST_TERM_ROW[1]: [row]})
+        driver.async_script = lambda row, selector, old_defs, timeout: self.SUGGESTIONS.get(entry.text)
+        return driver, definition
+
+    def test_results_are_streamed(self):
+        driver, _ = self.make_driver()
+        results = WebDriver(driver=driver).iter_definitions(['Tree', 'Fire', 'Tree', 'Water'])
+        assert next(results) == ('Tree', 'a woody perennial plant', ['a plant', 'a woody perennial plant'])
+        assert list(results) == [('Fire', None, []), ('Water', 'H2O', ['H2O'])]
+
+    def test_lookup_resumes_after_the_form_broke(self):
+        driver, definition = self.make_driver()
+
+        # The form breaks once at the second word, so it is reopened and the lookup goes on from that word
+        def on_click():
+            definition.on_click = None
+            raise ElementNotInteractableException("The form re-rendered")
+
+        web_driver = WebDriver(driver=driver)
+        results = web_driver.iter_definitions(['Tree', 'Water'])
+        assert next(results)[0] == 'Tree'
+        definition.on_click = on_click
+        assert [w for w, _, _ in results] == ['Water']
+        assert web_driver.get_definitions(['Water', 'Fire', 'Water']) == ['H2O', None]
+
+
+class TestSingleFlight(TestCase):
+    def test_flights(self):
+        flights = SingleFlight()
+        tree, leader = flights.join('Tree')
+        assert leader and flights.join(' tree ') == (tree, False) and len(flights) == 1
+        with self.assertRaises(TimeoutError):
+            flights.wait(tree, 0.01)
+        threading.Timer(0.05, flights.resolve, (tree, 'a plant')).start()
+        assert flights.wait(tree) == 'a plant' and len(flights) == 0
+
+        water, _ = flights.join('Water')
+        flights.abandon(water)
+        flights.resolve(water, 'H2O')
+        with self.assertRaises(LookupError):
+            flights.wait(water)
+        assert flights.join('Water')[1], "A word of an ended flight is looked up again"
+        assert flights.coalesced == 1
+
+    def test_concurrent_lookups_share_a_word(self):
+        for leader_fails in (False, True):
+            flights = SingleFlight()
+            started, release = threading.Event(), threading.Event()
+            typed = []
+
+            def make_web_driver(slow_word):
+                driver, _ = TestIterDefinitions().make_driver()
+                entry = driver.children[Locators.FIRST_TERM_ROW[1]][0].children[Locators.TERM_ENTRY[1]][0]
+
+                def suggest(row, selector, old_defs, timeout):
+                    typed.append(entry.text)
+                    if entry.text == slow_word:
+                        started.set()
+                        release.wait()
+                        if leader_fails:
+                            raise WebDriverException("The browser died")
+                    return TestIterDefinitions.SUGGESTIONS.get(entry.text.capitalize())
+
+                driver.async_script = suggest
+                return WebDriver(driver=driver)
+
+            results = {}
+
+            def look_up(name, web_driver, words):
+                try:
+                    results[name] = web_driver.get_definitions(words, flights=flights)
+                except WebDriverException:
+                    results[name] = None
+
+            first = threading.Thread(target=look_up, args=('first', make_web_driver('Tree'), ['Tree']))
+            first.start()
+            started.wait()
+            second = threading.Thread(target=look_up, args=('second', make_web_driver(None), ['tree', 'Water']))
+            second.start()
+            while flights.coalesced == 0:
+                time.sleep(0.01)
+            release.set()
+            first.join()
+            second.join()
+
+            assert results['second'] == ['a woody perennial plant', 'H2O']
+            if leader_fails:
+                assert results['first'] is None and typed == ['Tree', 'Water', 'tree'], \
+                    "The follower of a failed lookup looks the word up itself"
+            else:
+                assert results['first'] == ['a woody perennial plant'] and typed == ['Tree', 'Water'], \
+                    "The word is typed only once"
+
+    def test_a_word_is_joined_when_it_is_typed(self):
+        for pipeline in (1, 2):
+            flights = SingleFlight()
+            started, release = threading.Event(), threading.Event()
+            first_driver, _ = TestIterDefinitions().make_driver()
+            entry = first_driver.children[Locators.FIRST_TERM_ROW[1]][0].children[Locators.TERM_ENTRY[1]][0]
+
+            # The first lookup is stuck at its first word, and the second one needs its last word
+            def suggest(row, selector, old_defs, timeout):
+                if entry.text == 'Water':
+                    started.set()
+                    release.wait()
+                return TestIterDefinitions.SUGGESTIONS.get(entry.text)
+
+            first_driver.async_script = suggest
+            results = {}
+            first = threading.Thread(target=lambda: results.update(
+                first=WebDriver(driver=first_driver).get_definitions(['Water', 'Tree'], flights=flights)))
+            first.start()
+            started.wait()
+            if pipeline > 1:
+                second_driver = TestPipelinedDefinitions().make_driver(pipeline, {})
+            else:
+                second_driver, _ = TestIterDefinitions().make_driver()
+            second = threading.Thread(target=lambda: results.update(
+                second=WebDriver(driver=second_driver).get_definitions(['Tree'], pipeline, flights=flights)))
+            second.start()
+            second.join(5)
+            finished = not second.is_alive()
+            release.set()
+            first.join()
+            second.join()
+            assert finished and flights.coalesced == 0, "The second lookup doesn't wait for a word, which wasn't typed"
+            assert results['second'] == [TestPipelinedDefinitions.SUGGESTIONS['Tree'][-1] if pipeline > 1 else
+                                         'a woody perennial plant']
+            assert results['first'] == ['H2O', 'a woody perennial plant']
+
+
+class TestPipelinedDefinitions(TestCase):
+    SUGGESTIONS = {'Tree': ['a woody plant'], 'Water': ['H2O'], 'Sun': ['a star']}
+
+    def make_driver(self, n_rows, delays):
+        rows, entries, definitions = [], [], []
+        for _ in range(n_rows):
+            entries.append(FakeElement())
+            definitions.append(FakeElement())
+            rows.append(FakeElement(children={Locators.TERM_ENTRY[1]: [entries[-1]],
+                                              Locators.DEFINITION_ENTRY[1]: [definitions[-1]]}))
+        children = {Locators.TERM_ROWS[1]: rows, Locators.TERM_ENTRY[1]: entries,
+                    Locators.DEFINITION_ENTRY[1]: definitions}
+        children.update((Locators.term_row(i)[1], [row]) for i, row in enumerate(rows))
+        driver = FakeDriver(children=children)
+
+        # A row shows the suggestions of its word after the number of waits given in delays
+        def wait_for_any(term_rows, selector, old_defs, timeout):
+            ready = []
+            for j, row in enumerate(term_rows):
+                word = entries[rows.index(row)].text
+                if delays.get(word, 0) > 0:
+                    delays[word] -= 1
+                elif word in self.SUGGESTIONS and self.SUGGESTIONS[word] != old_defs[j]:
+                    ready.append([j, self.SUGGESTIONS[word]])
+            return ready
+
+        driver.async_script = wait_for_any
+        return driver
+
+    def test_rows_are_refilled(self):
+        driver = self.make_driver(2, {'Tree': 1})
+        results = list(WebDriver(driver=driver).iter_definitions(['Tree', 'Water', 'Sun', 'Water'], pipeline=2))
+        assert results == [('Water', 'H2O', ['H2O']), ('Tree', 'a woody plant', ['a woody plant']),
+                           ('Sun', 'a star', ['a star'])], "The results come in the order of the suggestions"
+
+        driver = self.make_driver(2, {})
+        web_driver = WebDriver(driver=driver)
+        assert web_driver.get_definitions(['Sun', 'Tree', 'Water'], pipeline=2) == ['a star', 'a woody plant', 'H2O']
+
+    def test_row_timeout(self):
+        driver = self.make_driver(2, {})
+        done = bytearray(2)
+        results = list(WebDriver(driver=driver)._iter_definitions_pipelined(['Fire', 'Tree'], done, 2, timeout=0.1))
+        assert results == [(1, 'a woody plant', ['a woody plant']), (0, None, [])]
+        assert done == b'\x01\x01'
+
+
+class TestDefinitionSink(TestCase):
+    def test_jsonl_and_csv(self):
+        results = [('Tree', 'a plant, woody', ['a plant, woody']), ('Fire', None, []), ('Water', 'H2O\n', ['H2O\n'])]
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ('results.jsonl', 'results.csv'):
+                path = os.path.join(directory, name)
+                with DefinitionSink(path, flush_every=2, flush_interval=60) as sink:
+                    sink.write_all(results[:2])
+                    # Records are on disk before the sink is closed
+                    assert read_definitions(path) == {'Tree': 'a plant, woody', 'Fire': None}
+                    sink.write(*results[2])
+                assert read_definitions(path) == {'Tree': 'a plant, woody', 'Fire': None, 'Water': 'H2O\n'}
+
+            with self.assertRaises(ValueError):
+                DefinitionSink(os.path.join(directory, 'results.txt'))
+
+
+class TestDefinitionCache(TestCase):
+    def test_merge_is_deterministic(self):
+        box1, box2, box3 = DefinitionCache('box1'), DefinitionCache('box2'), DefinitionCache('box3')
+        box1.put('Tree', 'a plant', timestamp=1)
+        box2.put('Tree', 'a woody perennial plant', timestamp=2)
+        box1.put('Water', 'water', timestamp=5)
+        box3.put('Water', 'H2O', timestamp=5)
+        box3.put('Fire', 'flames', timestamp=3)
+
+        merged = []
+        for order in itertools.permutations((box1, box2, box3)):
+            cache = DefinitionCache()
+            for other in order:
+                cache.merge(other)
+            merged.append(cache.entries())
+        assert all(entries == merged[0] for entries in merged), "Every merge order has to give the same cache"
+        # The newest definition wins, and a tie goes to the greater source
+        assert {w: e[0] for w, e in merged[0].items()} == {'Tree': 'a woody perennial plant', 'Water': 'H2O',
+                                                          'Fire': 'flames'}
+        assert box1.put('Tree', 'an old plant', timestamp=0) is False
+
+    def test_snapshot(self):
+        cache = DefinitionCache('box1')
+        cache.put('Tree', 'a plant', ['a plant', 'a tree'], timestamp=1.5)
+        cache.put('Вода', 'H2O', timestamp=2)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'definitions.json.gz')
+            cache.save_file(path)
+            with open(path, 'rb') as file:
+                data = file.read()
+            cache.save_file(path)
+            with open(path, 'rb') as file:
+                assert file.read() == data, "The same entries have to give the same bytes"
+
+            loaded = DefinitionCache('box2')
+            assert loaded.load_file(path) == 2
+            assert loaded.entries() == cache.entries()
+            assert loaded.get('Tree') == ('a plant', ['a plant', 'a tree']) and loaded.get('Fire') is None
+            assert (loaded.hits, loaded.misses) == (1, 1)
+            assert loaded.load_file(os.path.join(directory, 'missing.json.gz')) == 0
+
+            with gzip.open(path, 'rb') as file:
+                snapshot = json.loads(file.read())
+            for key, value, message in (('entries', snapshot['entries'][:1], "checksum"),
+                                        ('version', 2, "version"), ('format', 'csv', "snapshot")):
+                with gzip.open(path, 'wb') as file:
+                    file.write(json.dumps(dict(snapshot, **{key: value})).encode('utf-8'))
+                with self.assertRaisesRegex(ValueError, message):
+                    DefinitionCache().load_file(path)
+            with open(path, 'wb') as file:
+                file.write(data[:len(data) // 2])
+            with self.assertRaisesRegex(ValueError, "damaged"):
+                DefinitionCache().load_file(path)
+
+    def test_periodic_save(self):
+        cache = DefinitionCache()
+        stopped = threading.Event()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'definitions.json.gz')
+            saver = threading.Thread(target=_save_periodically, args=(cache, path, 0.05, stopped))
+            saver.start()
+            cache.put('Tree', 'a plant')
+            time.sleep(0.2)
+            stopped.set()
+            saver.join(1)
+            assert not saver.is_alive()
+            assert DefinitionCache().load_file(path) == 1, "The daemon doesn't wait for its exit to save the cache"
+
+    def test_lookup_skips_cached_words(self):
+        driver, _ = TestIterDefinitions().make_driver()
+        cache = DefinitionCache()
+        cache.put('Water', 'H2O', ['H2O'])
+        web_driver = WebDriver(driver=driver)
+        assert list(web_driver.iter_definitions(['Tree', 'Water', 'Fire'], cache=cache)) == [
+            ('Water', 'H2O', ['H2O']), ('Tree', 'a woody perennial plant', ['a plant', 'a woody perennial plant']),
+            ('Fire', None, [])
+        ]
+        assert 'Tree' in cache and 'Fire' not in cache, "Only the found definitions are cached"
+
+        # A job of cached words doesn't open the form
+        driver.current_url = 'https://quizlet.com/latest'
+        assert web_driver.get_definitions(['Tree', 'Water'], cache=cache) == ['a woody perennial plant', 'H2O']
+        assert driver.current_url == 'https://quizlet.com/latest'
+
+
+class TestCompactStrings(TestCase):
+    def test_strings(self):
+        values = ['Tree', None, 'Вода', '', 'Not found', 'Not found']
+        strings = CompactStrings(values, intern=True)
+        assert strings == values and strings.tolist() == values and len(strings) == 6
+        assert strings[2] == 'Вода' and strings[-1] == 'Not found' and strings.encoded(1) is None
+        assert strings[1:4] == [None, 'Вода', ''] and strings[::-2] == ['Not found', '', None]
+        assert strings.index('Not found') == 4 and 'Tree' in strings and 'tree' not in strings
+        # The second "Not found" costs the index of the text of the first one and a None flag
+        assert strings.nbytes == CompactStrings(values[:-1], intern=True).nbytes + 8 + 1
+
+        view = strings[:2]
+        view.append('Fire')
+        assert view == ['Tree', None, 'Fire'] and strings == values, "Appending to a slice doesn't change the strings"
+
+    def test_pairs(self):
+        rows = [('Tree', 'a plant'), ('Water', 'Not found'), ('Fire', 'Not found')]
+        pairs = CompactPairs(rows, intern=True)
+        assert pairs == rows and pairs[1] == ('Water', 'Not found') and pairs[1:] == rows[1:]
+        assert pairs.words == ['Tree', 'Water', 'Fire'] and isinstance(pairs[:2], CompactPairs)
+        assert CompactPairs.from_columns(pairs.words, pairs.definitions) == rows
+        assert to_import_text(pairs) == to_import_text(rows)
+
+        shards = shard_rows(pairs, 2)
+        assert all(isinstance(s, CompactPairs) for s in shards) and shards == [rows[:2], rows[2:]]
+
+    def test_memory(self):
+        import tracemalloc
+
+        def make_rows(n):
+            return ((f"word{i}", f"the definition of the word number {i}") for i in range(n))
+
+        def measure(build):
+            tracemalloc.start()
+            try:
+                rows = build(make_rows(100000))
+                return tracemalloc.get_traced_memory()[0], rows
+            finally:
+                tracemalloc.stop()
+
+        list_memory, _ = measure(list)
+        compact_memory, _ = measure(CompactPairs)
+        assert compact_memory * 2.5 < list_memory, f"{compact_memory} bytes compact, {list_memory} bytes as a list"
+
+    def test_definitions_memory(self):
+        import tracemalloc
+
+        driver, _ = TestIterDefinitions().make_driver()
+        entry = driver.children[Locators.FIRST_TERM_ROW[1]][0].children[Locators.TERM_ENTRY[1]][0]
+        driver.async_script = lambda row, selector, old_defs, timeout: [f"the definition of the {entry.text}"]
+        words = [f"word{i}" for i in range(20000)]
+        tracemalloc.start()
+        try:
+            definitions = WebDriver(driver=driver).get_definitions(words)
+            memory, peak = tracemalloc.get_traced_memory()
+            definitions_list = list(definitions)
+            list_memory = tracemalloc.get_traced_memory()[0] - memory
+        finally:
+            tracemalloc.stop()
+        assert definitions_list[-1] == "the definition of the word19999"
+        assert peak < 2 * list_memory, f"{peak} bytes at the peak, {list_memory} bytes as a list"
+
+
+class TestFormats(TestCase):
+    ROWS = [('Tree', 'a woody plant, "big"'), ('Water', 'H2O\n<liquid> & clear'), ('Fire', '')]
+
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ('words.csv', 'words.tsv', 'words.txt'):
+                path = os.path.join(directory, name)
+                assert write_rows(path, self.ROWS, chunk_size=2) == 3
+                chunks = list(read_rows(path, chunk_size=2))
+                assert [len(c) for c in chunks] == [2, 1], "The rows have to be read in chunks"
+                assert [r for c in chunks for r in c] == self.ROWS, f"{name} has to keep the rows as they are"
+
+            # Anki reads the fields as HTML and is told so by the header
+            with open(os.path.join(directory, 'words.txt'), 'r', encoding='utf-8') as file:
+                lines = file.read().splitlines()
+            assert lines[:2] == ['#separator:tab', '#html:true']
+            assert lines[3] == 'Water\tH2O<br>&lt;liquid&gt; &amp; clear'
+
+            with self.assertRaises(ValueError):
+                write_rows(os.path.join(directory, 'words.json'), self.ROWS)
+
+
+class TestWordIndex(TestCase):
+    def test_incremental_search(self):
+        index = WordIndex()
+        index.add(1, 'Tree', 'A woody plant')
+        index.add(2, 'Trend', 'A general direction')
+        index.add(3, 'Water', 'A clear liquid')
+
+        # Case 1: Words match by their beginning, definitions by any part of 3 characters and more
+        assert index.search('tr') == {1, 2}
+        assert index.search('TREE') == {1}
+        assert index.search('lant') == {1}
+        assert index.search('an') == set(), "Short queries don't search the definitions"
+        assert index.search('a w') == {1}
+        assert index.search('') == {1, 2, 3}
+
+        # Case 2: The index follows the changes of the rows
+        index.add(1, 'Bush', 'A small woody plant')
+        index.remove(2)
+        assert index.search('tr') == set() and index.search('bu') == {1} and index.search('woody') == {1}
+        assert index.matches(3, 'liquid') and not index.matches(3, 'tree')
+        assert WordIndex.row_matches('Tree', 'A woody plant', 'WOOD') and WordIndex.row_matches('Tree', 'plant', '')
+        assert len(index) == 2
+
+    def test_matches_a_scan(self):
+        words = [''.join(w) for w in itertools.product('abc', repeat=4)]
+        rows = [(i, w.capitalize(), f"{words[-i]} {w[::-1]}") for i, w in enumerate(words)]
+        class SmallIndex(WordIndex):
+            MIN_REBUILD = 10
+
+        index = SmallIndex(rows)
+        assert index.search('abc') == {k for k, w, d in rows if WordIndex.row_matches(w, d, 'abc')}
+        # Most rows are removed, so the index is renumbered without them
+        for key, word, definition in rows[:60]:
+            index.remove(key)
+        index.add(70, 'Cab', 'a taxi')
+        rows = rows[60:70] + [(70, 'Cab', 'a taxi')] + rows[71:]
+        for query in ('a', 'Ca', 'cab', 'abca', 'taxi', 'b c', 'zzz', ''):
+            expected = {key for key, word, definition in rows if WordIndex.row_matches(word, definition, query)}
+            assert index.search(query) == expected, query
+
+
+class TestTable(TestCase):
+    def setUp(self) -> None:
+        self.root = tk.Tk()
+        self.table = Table(self.root)
+
+    def wait(self, job, path):
+        results = []
+        job(path, results.append)
+        while not results:
+            self.root.update()
+        return results[0]
+
+    def test_import_and_export(self):
+        self.table.extend(['Tree', 'Water'], ['a plant', None])
+        assert self.table.get_words_and_definitions() == [('Tree', 'a plant'), ('Water', 'Not found')]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'words.csv')
+            assert self.wait(self.table.export_file, path) == 2
+            self.table.clear()
+            assert len(self.table) == 0
+            assert self.wait(self.table.import_file, path) == 2
+            assert self.table.get_words_and_definitions() == [('Tree', 'a plant'), ('Water', 'Not found')]
+            assert isinstance(self.wait(self.table.import_file, os.path.join(directory, 'missing.csv')), OSError)
+
+    def test_filter(self):
+        self.table.extend(['Tree', 'Water', 'Trend'], ['a woody plant', 'a clear liquid', 'a direction'])
+        self.table.set_filter('tr')
+        assert self.table.get_visible_words() == ['Tree', 'Trend']
+
+        # New rows are shown only if they match, and hidden rows are still uploaded
+        self.table.append('Train', 'a vehicle')
+        self.table.append('Fire', 'a flame')
+        assert self.table.get_visible_words() == ['Tree', 'Trend', 'Train']
+        assert len(self.table.get_words_and_definitions()) == 5
+
+        self.table.set_filter('')
+        assert self.table.get_visible_words() == ['Tree', 'Water', 'Trend', 'Train', 'Fire']
+
+    def test_sort_keeps_the_filter(self):
+        self.table.extend(['Tree', 'Water', 'Trend'], ['a woody plant', 'a clear liquid', 'a direction'])
+        self.table.set_filter('tr')
+        self.table.sort(1)
+        assert self.table.get_visible_words() == ['Trend', 'Tree']
+        self.table.set_filter('')
+        assert self.table.get_visible_words() == ['Water', 'Trend', 'Tree']
+        assert self.table.get_words_and_definitions()[0] == ('Water', 'a clear liquid')
+
+    def tearDown(self) -> None:
+        self.root.destroy()
 
 
 class TestWordOptionsFrame(TestCase):
@@ -173,6 +909,412 @@ class TestWebDriver(TestCase):
         self.web_driver.quit()
 
 
+class TestDiffRows(TestCase):
+    @staticmethod
+    def apply(rows, edits):
+        removed, inserted, changed = edits
+        rows = list(rows)
+        for i in removed:
+            del rows[i]
+        for i, w, d in inserted:
+            rows.insert(i, (w, d))
+        for i, w, d in changed:
+            rows[i] = (w, d)
+        return rows
+
+    def test_diff_rows(self):
+        old = [('a', '1'), ('b', '2'), ('c', '3'), ('d', '4')]
+
+        # Case 1: Nothing changed
+        assert diff_rows(old, old) == ([], [], []), "Identical sets don't need any edit"
+
+        # Case 2: A row is deleted in the middle
+        assert diff_rows(old, [('a', '1'), ('c', '3'), ('d', '4')]) == ([1], [], []), "Only row 1 is removed"
+
+        # Case 3: A definition is changed and a row is appended
+        new = [('a', '1'), ('b', 'two'), ('c', '3'), ('d', '4'), ('e', '5')]
+        assert diff_rows(old, new) == ([], [(4, 'e', '5')], [(1, 'b', 'two')])
+
+        # Case 4: Rows are deleted at the end
+        assert diff_rows(old, old[:2]) == ([3, 2], [], []), "Rows are removed from the last one"
+
+        # Case 5: Applying the edits gives the new rows
+        new = [('x', '0'), ('a', '1'), ('c', '33'), ('f', '6'), ('g', '7')]
+        assert self.apply(old, diff_rows(old, new)) == new
+
+    def test_insertions_touch_only_new_rows(self):
+        old = [(str(i), 'definition') for i in range(1000)]
+
+        # Case 1: A row is inserted at the front
+        new = [('new', 'row')] + old
+        assert diff_rows(old, new) == ([], [(0, 'new', 'row')], []), "Only the new row is touched"
+
+        # Case 2: Rows are inserted in the middle and a row is removed
+        new = old[:500] + [('x', '1'), ('y', '2')] + old[500:700] + old[701:]
+        edits = diff_rows(old, new)
+        assert edits == ([700], [(500, 'x', '1'), (501, 'y', '2')], [])
+        assert self.apply(old, edits) == new
+
+
+class TestToImportText(TestCase):
+    def test_to_import_text(self):
+        # Case 1: Plain words and definitions
+        assert to_import_text([('a', '1'), ('b', '2')]) == 'a\t1\nb\t2'
+
+        # Case 2: Separators inside definitions are replaced with spaces
+        text = to_import_text([('tab\tword', 'line\nbreak'), ('crlf', 'one\r\ntwo')])
+        assert text == 'tab word\tline break\ncrlf\tone two', "Every card has to stay on its own line"
+
+        # Case 3: Custom separators
+        text = to_import_text([('a;b', 'c - d'), ('e', 'f')], term_separator=' - ', row_separator=';')
+        assert text == 'a b - c d;e - f'
+
+
+class TestCommandTracer(TestCase):
+    class FakeExecutor:
+        def execute(self, command, params):
+            return {'value': command}
+
+    class FakeDriver:
+        def __init__(self):
+            self.command_executor = TestCommandTracer.FakeExecutor()
+
+    def test_round_trips_and_save(self):
+        driver = self.FakeDriver()
+        tracer = CommandTracer()
+        tracer.attach(driver)
+
+        driver.command_executor.execute('get', {})
+        with tracer.operation('get_definitions', word='Tree'):
+            for command in ('sendKeysToElement', 'clickElement', 'findElement'):
+                assert driver.command_executor.execute(command, {}) == {'value': command}
+            with tracer.operation('clear'):
+                driver.command_executor.execute('clickElement', {})
+
+        assert tracer.round_trips() == {None: {'get': 1},
+                                        'get_definitions': {'sendKeysToElement': 1, 'clickElement': 1,
+                                                            'findElement': 1},
+                                        'clear': {'clickElement': 1}}
+
+        path = 'test_trace.json'
+        tracer.save(path)
+        try:
+            with open(path, 'r') as file:
+                events = json.load(file)['traceEvents']
+        finally:
+            os.remove(path)
+        assert len(events) == 7, "5 commands and 2 operations"
+        operation = [e for e in events if e['name'] == 'get_definitions'][0]
+        assert operation['args'] == {'word': 'Tree', 'round_trips': 4}, "Nested commands count in the parent"
+
+
+class TestReplay(TestCase):
+    class BrowserExecutor:
+        """Answers the commands like a browser on the new set page, whose create button opens the set"""
+
+        def __init__(self):
+            self.url = 'https://quizlet.com/create-set'
+
+        def execute(self, command, params):
+            if command == 'newSession':
+                return {'value': {'sessionId': 'session-1', 'capabilities': {'browserName': 'chrome'}}}
+            if command == 'clickElement':
+                self.url = 'https://quizlet.com/123456789/nature-flash-cards/'
+            values = {'getCurrentUrl': self.url, 'w3cGetCurrentWindowHandle': 'window-0', 'w3cExecuteScript': True,
+                      'findElement': {'element-6066-11e4-a52e-4f735466cecf': 'element-1'}, 'isElementEnabled': True}
+            return {'value': values.get(command)}
+
+    def test_record_and_replay(self):
+        from selenium.webdriver import Remote
+        recorder = CommandRecorder()
+        web_driver = WebDriver(driver=Remote(command_executor=self.BrowserExecutor()), recorder=recorder)
+        assert web_driver._submit_set(Locators.CREATE_SET_BUTTON) == '123456789'
+
+        path = 'test_replay.json'
+        recorder.save(path)
+        try:
+            # Case 1: The replay serves the recorded run without a browser
+            executor = ReplayExecutor(path, time_scale=0)
+            replayed = WebDriver(driver=Remote(command_executor=executor))
+            assert replayed._submit_set(Locators.CREATE_SET_BUTTON) == '123456789'
+            assert executor.remaining() == 0, "Every recorded command had to be replayed"
+
+            # Case 2: A command, which wasn't recorded, fails the replay
+            replayed = WebDriver.replay(path, time_scale=0)
+            with self.assertRaises(ValueError):
+                replayed.log_in('user', 'password')
+        finally:
+            os.remove(path)
+
+
+class TestSessionPool(TestCase):
+    class FakeSession:
+        def __init__(self):
+            self.alive = True
+            self.quit_called = False
+            self.memory = 0
+
+        def log_in(self, username, password):
+            return password == 'valid'
+
+        def is_alive(self):
+            return self.alive
+
+        def memory_usage(self):
+            return self.memory
+
+        def quit(self):
+            self.quit_called = True
+
+    def test_recycling(self):
+        pool = SessionPool(1, 'user', 'valid', max_operations=3, max_memory=100, session_factory=self.FakeSession)
+        pool.start()
+
+        # Case 1: A session is reused until it performs max_operations operations
+        session = pool.acquire()
+        pool.release(session, 2)
+        assert pool.acquire() is session, "The session performed only 2 operations"
+        pool.release(session, 1)
+        new_session = pool.acquire()
+        assert new_session is not session and session.quit_called, "The session had to be recycled"
+
+        # Case 2: A session is recycled when its browser uses too much memory
+        new_session.memory = 101
+        pool.release(new_session)
+        session = pool.acquire()
+        assert session is not new_session, "The session used too much memory"
+        pool.release(session)
+
+        # Case 3: A dead session is replaced when it is acquired
+        session.alive = False
+        assert pool.acquire() is not session, "The session's browser doesn't respond"
+        assert pool.stats()['recycled'] == 3
+
+    def test_failed_replacement(self):
+        failing = []
+
+        def factory():
+            if failing:
+                raise RuntimeError("Chrome didn't start")
+            return self.FakeSession()
+
+        pool = SessionPool(1, 'user', 'valid', max_operations=1, session_factory=factory)
+        pool.start()
+
+        # Case 1: A session over the limit keeps working, if its replacement fails
+        session = pool.acquire()
+        failing.append(True)
+        pool.release(session)
+        assert pool.stats()['idle'] == 1 and not session.quit_called, "The session had to stay in the pool"
+
+        # Case 2: A dead session stays in the pool, if its replacement fails, and is replaced by the next acquire
+        session = pool.acquire()
+        session.alive = False
+        pool.release(session)
+        with self.assertRaises(RuntimeError):
+            pool.acquire(timeout=1)
+        assert pool.stats()['idle'] == 1, "The pool shouldn't shrink"
+        failing.clear()
+        assert pool.acquire(timeout=1) is not session and session.quit_called, "The dead session had to be replaced"
+
+    def test_invalid_userdata(self):
+        pool = SessionPool(1, 'user', 'invalid', session_factory=self.FakeSession)
+        with self.assertRaises(ValueError, msg="Provided userdata is not valid"):
+            pool.start()
+
+
+class TestSharding(TestCase):
+    class FakeSession(TestSessionPool.FakeSession):
+        lock = threading.Lock()
+        running = 0
+        max_running = 0
+
+        def upload_quiz(self, quiz_name, quiz_description, words_and_definitions, import_mode=False):
+            cls = TestSharding.FakeSession
+            with cls.lock:
+                cls.running += 1
+                cls.max_running = max(cls.max_running, cls.running)
+            time.sleep(0.05)
+            with cls.lock:
+                cls.running -= 1
+            if quiz_name.endswith('(3/4)'):
+                raise RuntimeError("The set could not be created")
+            return str(len(words_and_definitions)) + quiz_name[-4]
+
+        def sync_quiz(self, set_id, quiz_name, quiz_description, old, new):
+            return set_id
+
+    def test_shard_rows(self):
+        assert [len(s) for s in shard_rows(range(1001), 500)] == [334, 334, 333]
+        assert [len(s) for s in shard_rows(range(5000), 500)] == [500] * 10
+        assert shard_rows([], 500) == [[]]
+        assert shard_names('Nature', 2) == ['Nature (1/2)', 'Nature (2/2)'] and shard_names('Nature', 1) == ['Nature']
+
+    def test_concurrent_upload(self):
+        pool = SessionPool(4, 'user', 'valid', session_factory=self.FakeSession)
+        pool.start()
+        synced_sets = SyncedSets()
+        synced_sets.set_set('Nature (4/4)', '99', [('Old', 'row')])
+        rows = [(f"word{i}", f"definition{i}") for i in range(10)]
+        try:
+            report = upload_shards(pool, 'Nature', '', rows, 3, synced_sets)
+        finally:
+            pool.close()
+
+        assert [(r['name'], r['cards'], r['set_id']) for r in report] == [
+            ('Nature (1/4)', 3, '31'), ('Nature (2/4)', 3, '32'), ('Nature (3/4)', 2, None), ('Nature (4/4)', 2, '99')]
+        assert report[0]['url'] == 'https://quizlet.com/31' and 'RuntimeError' in report[2]['error']
+        assert self.FakeSession.max_running > 1, "The sets had to be uploaded concurrently"
+        assert synced_sets.get_set('Nature (1/4)') == ('31', rows[:3]) and synced_sets.get_set('Nature (3/4)') is None
+
+
+class TestSoak(TestCase):
+    def test_stand_in_site(self):
+        from urllib.request import Request, urlopen
+        site = StandInSite(latency=0)
+        site.start()
+        try:
+            home = urlopen(site.base_url).read().decode('utf-8')
+            assert "class=\"LoginPromptModal-form\"" in home and 'id="username"' in home
+            new_set = urlopen(site.base_url + 'create-set').read().decode('utf-8')
+            assert 'aria-label="+ Add card"' in new_set and 'AutosuggestContext-suggestions' in new_set
+            assert json.loads(urlopen(site.base_url + 'suggest?term=Tree').read())[0] == 'Tree'
+            set_ids = [json.loads(urlopen(Request(site.base_url + 'sets', b'Soak', method='POST')).read())['id']
+                       for _ in range(2)]
+            assert set_ids[1] == set_ids[0] + 1
+        finally:
+            site.close()
+
+    def test_check_drift(self):
+        def sample(heap, latency):
+            return {'python_heap': heap, 'chrome_rss': None, 'log_in': 1.0, 'get_definitions': latency,
+                    'upload_quiz': 2.0}
+
+        # The first sample is a warmup, so its heap doesn't count
+        steady = [sample(10 ** 9, 0.5)] + [sample(100, 0.5)] * 10
+        assert check_drift(steady, window=5) == []
+
+        leaking = [sample(100 + 10 * i, 0.5 + 0.1 * i) for i in range(11)]
+        problems = check_drift(leaking, window=5)
+        assert [p.split()[0] for p in problems] == ['python_heap', 'get_definitions']
+
+        with self.assertRaises(ValueError):
+            check_drift(steady[:5], window=5)
+
+
+class TestSettings(TestCase):
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'settings.json')
+            settings = Settings()
+            settings.load_file(path)
+            assert settings == Settings(), "Missing file keeps the defaults"
+
+            Settings(poll_frequency=0.1, pipeline=4).save_file(path)
+            settings.load_file(path)
+            assert settings.poll_frequency == 0.1 and settings.pipeline == 4 and settings.wait_timeout == 10
+
+        with self.assertRaises(ValueError):
+            Settings(timeout=1)
+        settings = Settings(suggestion_timeout=2)
+        assert WebDriver(driver=FakeDriver(), settings=settings).get_settings() is settings
+
+    def test_tune(self):
+        def measure(settings):
+            if settings.headless:
+                raise ValueError("Provided userdata is not valid")
+            # A short suggestion timeout is faster, but loses definitions
+            found = 10 if settings.suggestion_timeout >= 4 else 8
+            return found, settings.poll_frequency + 1 / settings.pipeline + settings.suggestion_timeout
+
+        trials = []
+        space = {'poll_frequency': [0.1, 0.5], 'suggestion_timeout': [2, 4], 'pipeline': [1, 4], 'headless': [True]}
+        best, result = tune(measure, Settings(), space, lambda s, r: trials.append(r))
+        assert (best.poll_frequency, best.suggestion_timeout, best.pipeline, best.headless) == (0.1, 4, 4, False)
+        assert result == (10, 4.35) and len(trials) == 6 and trials[-1] is None
+
+    def test_stand_in_runs_keep_the_real_settings(self):
+        site_settings = {'headless', 'notification_timeout', 'suggestion_timeout'}
+        assert not site_settings & set(SEARCH_SPACE) and site_settings <= set(SITE_SEARCH_SPACE)
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(__file__)))
+            run = subprocess.run([sys.executable, '-m', 'quizlet_writer.tune', '--output', 'settings.json'],
+                                 cwd=directory, env=env, capture_output=True, text=True)
+            assert run.returncode != 0 and 'settings.json' in run.stderr
+            assert not os.path.exists(os.path.join(directory, 'settings.json'))
+
+
+class TestStallWatchdog(TestCase):
+    class FakeLoop:
+        """Runs the after() callbacks on the thread, which calls run, like the Tk main loop"""
+
+        def __init__(self):
+            self.calls = {}
+            self.ids = itertools.count()
+
+        def after(self, ms, callback):
+            after_id = next(self.ids)
+            self.calls[after_id] = (time.monotonic() + ms / 1000, callback)
+            return after_id
+
+        def after_cancel(self, after_id):
+            self.calls.pop(after_id, None)
+
+        def run(self, seconds):
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                for after_id, (due, callback) in list(self.calls.items()):
+                    if due <= time.monotonic():
+                        del self.calls[after_id]
+                        callback()
+                time.sleep(0.005)
+
+    def test_stall_is_caught_with_its_stack(self):
+        def blocking_call():
+            time.sleep(0.4)
+
+        loop = self.FakeLoop()
+        watchdog = StallWatchdog(loop, threshold=0.1, interval=0.02)
+        watchdog.start()
+        with self.assertLogs('quizlet_writer.watchdog', 'WARNING') as logs:
+            loop.run(0.2)
+            blocking_call()
+            loop.run(0.2)
+        watchdog.stop()
+
+        stalls = watchdog.stalls()
+        assert len(stalls) == 1, "Only the blocking call stalls the loop"
+        duration, stack = stalls[0]
+        assert 0.3 < duration < 0.5 and 'blocking_call' in stack
+        assert 'blocking_call' in logs.output[0] and 'ended' in logs.output[1]
+
+
+class TestFairJobQueue(TestCase):
+    def test_clients_take_turns(self):
+        jobs = FairJobQueue()
+        for job in ('a1', 'a2', 'a3'):
+            jobs.put('a', job)
+        jobs.put('b', 'b1')
+        jobs.put('c', 'c1')
+        jobs.put('b', 'b2')
+        assert len(jobs) == 6
+        assert [jobs.get() for _ in range(6)] == ['a1', 'b1', 'c1', 'a2', 'b2', 'a3']
+        assert len(jobs) == 0
+
+
+class TestJobDaemon(TestCase):
+    def test_compact_jobs(self):
+        class Pool:
+            def stats(self):
+                return {'sessions': 1}
+
+        daemon = JobDaemon(Pool())
+        job_id = daemon.submit({'words': ['Tree', ' Water ']})
+        job = daemon.get_job(job_id)
+        assert job['words'] == ['Tree', 'Water'] and type(job['words']) is list
+        json.dumps(job)
+
+
 class TestUserData(TestCase):
     def test_update_userdata(self):
         user_data = UserData()